@@ -0,0 +1,32 @@
+"""add chromaprint_length to tracks
+
+Revision ID: d41c8b2f9a77
+Revises: b96f382d0813
+Create Date: 2026-08-29 10:12:31.118264
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c8b2f9a77"
+down_revision: str | None = "b96f382d0813"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("tracks", sa.Column("chromaprint_length", sa.Integer(), nullable=True))
+    # Backfill from the stored fingerprint strings (comma-separated ints).
+    op.execute(
+        "UPDATE tracks "
+        "SET chromaprint_length = "
+        "array_length(string_to_array(chromaprint_fingerprint, ','), 1) "
+        "WHERE chromaprint_fingerprint IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tracks", "chromaprint_length")
@@ -0,0 +1,28 @@
+"""add chromaprint_duration index
+
+Revision ID: e7a39c05f218
+Revises: d41c8b2f9a77
+Create Date: 2026-08-29 11:03:47.502918
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a39c05f218"
+down_revision: str | None = "d41c8b2f9a77"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tracks_chromaprint_duration",
+        "tracks",
+        ["chromaprint_duration"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tracks_chromaprint_duration", table_name="tracks")
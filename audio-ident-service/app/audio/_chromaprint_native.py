@@ -0,0 +1,134 @@
+"""Native Chromaprint fingerprinting via ctypes (libchromaprint).
+
+Optional fast path for ``generate_chromaprint`` that calls the
+Chromaprint shared library directly instead of spawning an fpcalc
+subprocess per track. Eliminates fork/exec + linker overhead on batch
+ingestion. Enabled via ``settings.chromaprint_native``; when the library
+cannot be loaded the caller falls back to the fpcalc subprocess path.
+
+Note:
+    ctypes calls are synchronous and hold the GIL. Callers in async code
+    must wrap ``generate_raw_fingerprint`` in ``loop.run_in_executor``
+    (same rule as the Olaf CFFI calls).
+"""
+
+import ctypes
+import ctypes.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+# CHROMAPRINT_ALGORITHM_TEST2, fpcalc's default.
+_ALGORITHM_TEST2 = 1
+
+_lib: ctypes.CDLL | None = None
+_load_attempted = False
+
+
+def _load_library() -> ctypes.CDLL | None:
+    """Load libchromaprint and declare its call signatures.
+
+    The result (including failure) is cached; at most one load attempt
+    is made per process.
+
+    Returns:
+        The loaded library, or ``None`` if unavailable.
+    """
+    global _lib, _load_attempted
+    if _load_attempted:
+        return _lib
+    _load_attempted = True
+
+    name = ctypes.util.find_library("chromaprint")
+    if name is None:
+        logger.info("libchromaprint not found; native Chromaprint unavailable")
+        return None
+
+    try:
+        lib = ctypes.CDLL(name)
+        lib.chromaprint_new.argtypes = [ctypes.c_int]
+        lib.chromaprint_new.restype = ctypes.c_void_p
+        lib.chromaprint_free.argtypes = [ctypes.c_void_p]
+        lib.chromaprint_free.restype = None
+        lib.chromaprint_start.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        lib.chromaprint_start.restype = ctypes.c_int
+        lib.chromaprint_feed.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_int16),
+            ctypes.c_int,
+        ]
+        lib.chromaprint_feed.restype = ctypes.c_int
+        lib.chromaprint_finish.argtypes = [ctypes.c_void_p]
+        lib.chromaprint_finish.restype = ctypes.c_int
+        lib.chromaprint_get_raw_fingerprint.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_uint32)),
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        lib.chromaprint_get_raw_fingerprint.restype = ctypes.c_int
+        lib.chromaprint_dealloc.argtypes = [ctypes.c_void_p]
+        lib.chromaprint_dealloc.restype = None
+    except (OSError, AttributeError) as e:
+        logger.warning("Failed to load libchromaprint (%s): %s", name, e)
+        return None
+
+    logger.info("Loaded libchromaprint: %s", name)
+    _lib = lib
+    return lib
+
+
+def is_available() -> bool:
+    """Whether the Chromaprint shared library could be loaded."""
+    return _load_library() is not None
+
+
+def generate_raw_fingerprint(pcm_s16le: bytes, sample_rate: int = 16000) -> str | None:
+    """Generate a raw Chromaprint fingerprint from s16le PCM.
+
+    Produces the same comma-separated integer format as ``fpcalc -raw``
+    (algorithm TEST2).
+
+    Args:
+        pcm_s16le: Raw 16-bit signed int mono PCM.
+        sample_rate: PCM sample rate in Hz.
+
+    Returns:
+        Raw fingerprint string, or ``None`` on failure.
+    """
+    lib = _load_library()
+    if lib is None or not pcm_s16le:
+        return None
+
+    ctx = lib.chromaprint_new(_ALGORITHM_TEST2)
+    if not ctx:
+        logger.warning("chromaprint_new failed")
+        return None
+
+    try:
+        if not lib.chromaprint_start(ctx, sample_rate, 1):
+            logger.warning("chromaprint_start failed")
+            return None
+
+        n_samples = len(pcm_s16le) // 2
+        buf = (ctypes.c_int16 * n_samples).from_buffer_copy(pcm_s16le[: n_samples * 2])
+        if not lib.chromaprint_feed(ctx, buf, n_samples):
+            logger.warning("chromaprint_feed failed")
+            return None
+        if not lib.chromaprint_finish(ctx):
+            logger.warning("chromaprint_finish failed")
+            return None
+
+        fp_ptr = ctypes.POINTER(ctypes.c_uint32)()
+        size = ctypes.c_int()
+        if not lib.chromaprint_get_raw_fingerprint(
+            ctx, ctypes.byref(fp_ptr), ctypes.byref(size)
+        ):
+            logger.warning("chromaprint_get_raw_fingerprint failed")
+            return None
+
+        try:
+            return ",".join(str(fp_ptr[i]) for i in range(size.value))
+        finally:
+            lib.chromaprint_dealloc(ctypes.cast(fp_ptr, ctypes.c_void_p))
+    finally:
+        lib.chromaprint_free(ctx)
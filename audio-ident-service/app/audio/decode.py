@@ -6,6 +6,7 @@ supporting dual sample-rate output for Olaf (16kHz) and CLAP (48kHz).
 
 import asyncio
 import logging
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,65 @@ async def decode_to_pcm(
     return stdout
 
 
+async def decode_to_pcm_path(
+    audio_path: Path,
+    target_sample_rate: int,
+    output_format: str = "f32le",
+) -> bytes:
+    """Decode an audio file on disk to raw PCM using ffmpeg subprocess.
+
+    Unlike ``decode_to_pcm``, ffmpeg reads the source file directly, so
+    the compressed audio is never loaded into Python memory — constant
+    memory per call regardless of source file size. Prefer this for
+    files already on disk (batch ingestion, evaluation corpora); use
+    ``decode_to_pcm`` for in-memory uploads.
+
+    Args:
+        audio_path: Path to an audio file (any format ffmpeg supports).
+        target_sample_rate: Output sample rate (e.g. 16000 or 48000).
+        output_format: PCM format - ``"f32le"`` for Olaf/CLAP,
+            ``"s16le"`` for Chromaprint.
+
+    Returns:
+        Raw PCM bytes in the requested format.
+
+    Raises:
+        AudioDecodeError: If ffmpeg fails or produces no output.
+    """
+    codec = f"pcm_{output_format}"
+
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        str(audio_path),
+        "-ar",
+        str(target_sample_rate),
+        "-ac",
+        "1",
+        "-f",
+        output_format,
+        "-acodec",
+        codec,
+        "pipe:1",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    stdout, stderr = await proc.communicate()
+
+    if proc.returncode != 0:
+        err_msg = stderr.decode(errors="replace").strip()
+        raise AudioDecodeError(f"ffmpeg exited with code {proc.returncode}: {err_msg}")
+
+    if not stdout:
+        raise AudioDecodeError("ffmpeg produced no output")
+
+    return stdout
+
+
 async def decode_dual_rate(audio_data: bytes) -> tuple[bytes, bytes]:
     """Decode to both 16kHz f32le and 48kHz f32le in parallel.
 
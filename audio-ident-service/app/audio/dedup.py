@@ -6,14 +6,17 @@ similarity within a duration tolerance window.
 """
 
 import asyncio
+import functools
 import logging
 import uuid
 
 import numpy as np
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.audio import _chromaprint_native
 from app.models.track import Track
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,8 @@ def f32le_to_s16le(pcm_f32le: bytes) -> bytes:
     Returns:
         Raw 16-bit signed integer little-endian PCM data.
     """
+    if not pcm_f32le:
+        return b""
     samples = np.frombuffer(pcm_f32le, dtype=np.float32)
     return np.clip(samples * 32767, -32768, 32767).astype(np.int16).tobytes()
 
@@ -55,6 +60,9 @@ async def generate_chromaprint(pcm_16k_s16le: bytes, duration: float) -> str | N
 
     Uses the ``fpcalc`` CLI binary from Chromaprint/pyacoustid via
     ``asyncio.create_subprocess_exec`` to avoid blocking the event loop.
+    When ``settings.chromaprint_native`` is enabled and libchromaprint
+    can be loaded, calls the shared library directly instead (no
+    subprocess spawn per track), falling back to fpcalc on failure.
 
     Note:
         Takes s16le format. The caller should convert f32le to s16le via
@@ -70,6 +78,18 @@ async def generate_chromaprint(pcm_16k_s16le: bytes, duration: float) -> str | N
     if not pcm_16k_s16le:
         return None
 
+    if settings.chromaprint_native and _chromaprint_native.is_available():
+        # ctypes calls hold the GIL; run in an executor so the event
+        # loop stays responsive (same rule as Olaf CFFI calls).
+        loop = asyncio.get_running_loop()
+        fingerprint = await loop.run_in_executor(
+            None,
+            functools.partial(_chromaprint_native.generate_raw_fingerprint, pcm_16k_s16le),
+        )
+        if fingerprint is not None:
+            return fingerprint
+        logger.warning("Native Chromaprint failed; falling back to fpcalc subprocess")
+
     try:
         proc = await asyncio.create_subprocess_exec(
             "fpcalc",
@@ -124,71 +144,116 @@ async def generate_chromaprint(pcm_16k_s16le: bytes, duration: float) -> str | N
         return None
 
 
-def _fingerprint_similarity(fp1: str, fp2: str) -> float:
-    """Compute similarity between two raw Chromaprint fingerprints.
-
-    Compares fingerprints as comma-separated integer arrays using
-    bitwise Hamming distance.
+def _parse_fp(fp: str) -> np.ndarray | None:
+    """Parse a raw Chromaprint fingerprint string into a uint32 array.
 
     Args:
-        fp1: First raw fingerprint string (comma-separated ints).
-        fp2: Second raw fingerprint string (comma-separated ints).
+        fp: Raw fingerprint string (comma-separated ints).
 
     Returns:
-        Similarity score between 0.0 and 1.0.
+        uint32 numpy array, or ``None`` if the string is malformed.
     """
     try:
-        arr1 = [int(x) for x in fp1.split(",")]
-        arr2 = [int(x) for x in fp2.split(",")]
+        # fpcalc emits signed 32-bit values; int64 parse + uint32 cast
+        # wraps negatives the same way the old `xor & 0xFFFFFFFF` did.
+        return np.array(fp.split(","), dtype=np.int64).astype(np.uint32)
     except ValueError:
-        return 0.0
+        return None
 
-    if not arr1 or not arr2:
-        return 0.0
 
+def _fingerprint_similarity_parsed(arr1: np.ndarray, arr2: np.ndarray) -> float:
+    """Compute similarity between two parsed fingerprint arrays.
+
+    Compares the overlapping prefix using bitwise Hamming distance and
+    penalizes length mismatch.
+
+    Args:
+        arr1: First fingerprint as a uint32 array.
+        arr2: Second fingerprint as a uint32 array.
+
+    Returns:
+        Similarity score between 0.0 and 1.0.
+    """
     # Compare overlapping portion
-    min_len = min(len(arr1), len(arr2))
+    min_len = min(arr1.size, arr2.size)
     if min_len == 0:
         return 0.0
 
-    matching_bits = 0
     total_bits = min_len * 32  # Each int is 32 bits
-
-    for i in range(min_len):
-        xor = arr1[i] ^ arr2[i]
-        # Count differing bits
-        differing = bin(xor & 0xFFFFFFFF).count("1")
-        matching_bits += 32 - differing
+    xor = np.bitwise_xor(arr1[:min_len], arr2[:min_len])
+    # Popcount over a uint64 view halves the reduction length; numpy
+    # lowers bitwise_count to the hardware popcnt instruction either way.
+    even = xor.size & ~1
+    differing_bits = int(np.bitwise_count(xor[:even].view(np.uint64)).sum())
+    if xor.size != even:
+        differing_bits += int(np.bitwise_count(xor[-1]))
+    matching_bits = total_bits - differing_bits
 
     # Penalize length difference
-    max_len = max(len(arr1), len(arr2))
+    max_len = max(arr1.size, arr2.size)
     length_penalty = min_len / max_len
 
     return (matching_bits / total_bits) * length_penalty
 
 
+def _fingerprint_similarity(fp1: str, fp2: str) -> float:
+    """Compute similarity between two raw Chromaprint fingerprints.
+
+    Thin parse-then-delegate wrapper around
+    ``_fingerprint_similarity_parsed``. Callers comparing one query
+    fingerprint against many candidates should parse the query once with
+    ``_parse_fp`` and call the parsed variant directly.
+
+    Args:
+        fp1: First raw fingerprint string (comma-separated ints).
+        fp2: Second raw fingerprint string (comma-separated ints).
+
+    Returns:
+        Similarity score between 0.0 and 1.0.
+    """
+    arr1 = _parse_fp(fp1)
+    arr2 = _parse_fp(fp2)
+    if arr1 is None or arr2 is None:
+        return 0.0
+    return _fingerprint_similarity_parsed(arr1, arr2)
+
+
 async def check_content_duplicate(
     session: AsyncSession,
     fingerprint: str,
     duration: float,
     threshold: float = 0.85,
+    tolerance: float = 2.0,
 ) -> uuid.UUID | None:
     """Check for a content duplicate using Chromaprint similarity.
 
-    Scans tracks within +/-10% duration, compares fingerprint similarity.
+    Scans tracks within a duration window (+/-10%, widened to at least
+    ``tolerance`` seconds for short tracks), compares fingerprint
+    similarity.
 
     Args:
         session: Async SQLAlchemy session.
         fingerprint: Raw Chromaprint fingerprint string.
         duration: Duration in seconds of the candidate track.
         threshold: Minimum similarity score to consider a match (0.0 - 1.0).
+        tolerance: Minimum duration window half-width in seconds. The
+            relative 10% window collapses below fpcalc's whole-second
+            duration granularity for short tracks; the absolute floor
+            keeps re-encodes of those tracks in range.
 
     Returns:
         Track UUID of the best match if similarity exceeds threshold,
         ``None`` otherwise.
     """
-    duration_lower = duration * 0.9
-    duration_upper = duration * 1.1
+    # Parse the query fingerprint once instead of re-parsing it for
+    # every candidate row.
+    query_arr = _parse_fp(fingerprint)
+    if query_arr is None:
+        return None
+
+    duration_window = max(duration * 0.1, tolerance)
+    duration_lower = duration - duration_window
+    duration_upper = duration + duration_window
 
     stmt = select(Track.id, Track.chromaprint_fingerprint, Track.chromaprint_duration).where(
         Track.chromaprint_fingerprint.isnot(None),
@@ -197,6 +262,21 @@ async def check_content_duplicate(
         Track.chromaprint_duration <= duration_upper,
     )
 
+    # Length pre-filter: similarity is capped by min_len/max_len, so a
+    # candidate whose element count is outside [threshold * len,
+    # len / threshold] can never reach the threshold. Pushing this into
+    # SQL skips hopeless candidates without losing recall. Rows ingested
+    # before chromaprint_length existed (NULL) are kept.
+    if threshold > 0.0:
+        length_lower = int(query_arr.size * threshold)
+        length_upper = int(np.ceil(query_arr.size / threshold))
+        stmt = stmt.where(
+            or_(
+                Track.chromaprint_length.is_(None),
+                Track.chromaprint_length.between(length_lower, length_upper),
+            )
+        )
+
     result = await session.execute(stmt)
     rows = result.all()
 
@@ -206,7 +286,10 @@ async def check_content_duplicate(
     for track_id, track_fp, _track_dur in rows:
         if track_fp is None:
             continue
-        similarity = _fingerprint_similarity(fingerprint, track_fp)
+        candidate_arr = _parse_fp(track_fp)
+        if candidate_arr is None:
+            continue
+        similarity = _fingerprint_similarity_parsed(query_arr, candidate_arr)
         if similarity > best_similarity:
             best_similarity = similarity
             best_match_id = track_id
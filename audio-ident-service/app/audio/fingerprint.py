@@ -13,11 +13,14 @@ Audio must be 16kHz mono float32 PCM (f32le format).
 import asyncio
 import logging
 import os
+import re
 import tempfile
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
 from app.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -296,15 +299,27 @@ def _parse_olaf_output(stdout: str) -> list[OlafMatch]:
         if match is not None:
             matches.append(match)
 
-    # Sort by match_count descending (strongest matches first)
-    matches.sort(key=lambda m: m.match_count, reverse=True)
-    return matches
+    # Sort by match_count descending (strongest matches first). Large
+    # outputs sort their count column in C via argsort; tiny ones skip
+    # the numpy setup cost.
+    if len(matches) < 16:
+        matches.sort(key=lambda m: m.match_count, reverse=True)
+        return matches
+
+    counts = np.fromiter((m.match_count for m in matches), dtype=np.int64, count=len(matches))
+    order = np.argsort(-counts, kind="stable")
+    return [matches[i] for i in order]
+
+
+# Olaf emits either comma- or semicolon-separated fields; one precompiled
+# pattern handles both without a second split pass per line.
+_SEP = re.compile(r"\s*[,;]\s*")
 
 
 def _parse_olaf_line(line: str) -> OlafMatch | None:
     """Parse a single output line from olaf_c query.
 
-    Tries comma-separated first, then semicolon-separated as fallback.
+    Accepts comma- or semicolon-separated fields.
 
     Args:
         line: A single line of olaf_c output.
@@ -312,18 +327,12 @@ def _parse_olaf_line(line: str) -> OlafMatch | None:
     Returns:
         OlafMatch if parsing succeeds, None otherwise.
     """
-    # Try comma-separated first
-    parts = [p.strip() for p in line.split(",")]
-    if len(parts) >= 7:
-        return _parts_to_match(parts)
-
-    # Fallback: semicolon-separated
-    parts = [p.strip() for p in line.split(";")]
-    if len(parts) >= 7:
-        return _parts_to_match(parts)
-
-    logger.debug("Skipping unparseable Olaf output line: %s", line)
-    return None
+    parts = _SEP.split(line, maxsplit=6)
+    if len(parts) < 7:
+        logger.debug("Skipping unparseable Olaf output line: %s", line)
+        return None
+
+    return _parts_to_match(parts)
 
 
 def _parts_to_match(parts: list[str]) -> OlafMatch | None:
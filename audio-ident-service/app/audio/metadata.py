@@ -168,11 +168,5 @@ def compute_file_hash(file_path: Path) -> str:
     Returns:
         Lowercase hex-encoded SHA-256 digest.
     """
-    sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        while True:
-            chunk = f.read(65536)
-            if not chunk:
-                break
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
@@ -134,7 +134,9 @@ async def upsert_track_embeddings(
         points.append(
             models.PointStruct(
                 id=str(uuid.uuid4()),
-                vector=chunk.embedding,
+                # Embeddings are packed float32 arrays; Qdrant's
+                # PointStruct wants a plain list of floats.
+                vector=chunk.embedding.tolist(),
                 payload=payload,
             )
         )
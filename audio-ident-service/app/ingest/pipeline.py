@@ -217,6 +217,7 @@ async def ingest_file(
                 file_path=str(storage_path),
                 chromaprint_fingerprint=fingerprint,
                 chromaprint_duration=duration if fingerprint else None,
+                chromaprint_length=(fingerprint.count(",") + 1) if fingerprint else None,
                 olaf_indexed=olaf_success,
                 embedding_model=(settings.embedding_model if embedding_count > 0 else None),
                 embedding_dim=settings.embedding_dim if embedding_count > 0 else None,
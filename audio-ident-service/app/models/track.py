@@ -33,6 +33,9 @@ class Track(Base):
     # Chromaprint (ingestion-time content dedup ONLY)
     chromaprint_fingerprint: Mapped[str | None] = mapped_column(Text, nullable=True)
     chromaprint_duration: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Element count of the raw fingerprint; lets dedup pre-filter
+    # implausible candidates in SQL (length penalty bound).
+    chromaprint_length: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     # Olaf fingerprint status (fingerprints stored in Olaf LMDB, not PG)
     olaf_indexed: Mapped[bool] = mapped_column(default=False)
@@ -53,5 +56,7 @@ class Track(Base):
     __table_args__ = (
         Index("ix_tracks_file_hash", "file_hash_sha256", unique=True),
         Index("ix_tracks_artist_title", "artist", "title"),
+        # Dedup scans filter on the chromaprint duration window
+        Index("ix_tracks_chromaprint_duration", "chromaprint_duration"),
         Index("ix_tracks_ingested_at", "ingested_at"),
     )
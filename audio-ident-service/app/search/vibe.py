@@ -64,6 +64,50 @@ async def run_vibe_lane(
         List of VibeMatch sorted by similarity descending, filtered by
         the configurable vibe_match_threshold.
 
+    Raises:
+        ValueError: If clap_model or clap_processor is None (not loaded).
+    """
+    # 1-2. Generate the CLAP embedding for the query audio
+    embedding = await embed_query_pcm(
+        pcm_48k,
+        clap_model=clap_model,
+        clap_processor=clap_processor,
+    )
+    if embedding is None:
+        return []
+
+    # 3. Query Qdrant for nearest chunks
+    chunk_hits = await _query_qdrant(qdrant_client, embedding.tolist())
+
+    if not chunk_hits:
+        logger.debug("No chunk hits from Qdrant for vibe search")
+        return []
+
+    # 4-8. Aggregate, filter, and join with track metadata
+    return await chunk_hits_to_matches(
+        chunk_hits,
+        session=session,
+        max_results=max_results,
+        exact_match_track_id=exact_match_track_id,
+    )
+
+
+async def embed_query_pcm(
+    pcm_48k: bytes,
+    *,
+    clap_model: object,
+    clap_processor: object,
+) -> np.ndarray | None:
+    """Generate a CLAP embedding for query PCM audio.
+
+    Args:
+        pcm_48k: Raw 48kHz mono float32 little-endian PCM bytes.
+        clap_model: Loaded ClapModel instance.
+        clap_processor: Loaded ClapProcessor instance.
+
+    Returns:
+        The 512-dim embedding, or None for empty audio input.
+
     Raises:
         ValueError: If clap_model or clap_processor is None (not loaded).
     """
@@ -74,20 +118,20 @@ async def run_vibe_lane(
             "startup and available on app.state.clap_model / app.state.clap_processor."
         )
 
-    # 1. Convert PCM bytes to numpy array (f32le -- already 32-bit float from ffmpeg)
+    # Convert PCM bytes to numpy array (f32le -- already 32-bit float from ffmpeg)
     audio = np.frombuffer(pcm_48k, dtype=np.float32)
 
     if len(audio) == 0:
         logger.warning("Empty audio input for vibe search")
-        return []
+        return None
 
-    # 2. Generate CLAP embedding (CPU-bound, ~0.2s)
-    #    Use run_in_executor to avoid blocking the asyncio event loop.
-    #    Use semaphore to prevent concurrent CPU-bound inferences from
-    #    degrading latency.
+    # Generate CLAP embedding (CPU-bound, ~0.2s)
+    # Use run_in_executor to avoid blocking the asyncio event loop.
+    # Use semaphore to prevent concurrent CPU-bound inferences from
+    # degrading latency.
     loop = asyncio.get_running_loop()
     async with _clap_semaphore:
-        embedding = await loop.run_in_executor(
+        return await loop.run_in_executor(
             None,
             generate_embedding,
             audio,
@@ -95,16 +139,21 @@ async def run_vibe_lane(
             clap_processor,
         )
 
-    embedding_list = embedding.tolist()
 
-    # 3. Query Qdrant for nearest chunks
-    chunk_hits = await _query_qdrant(qdrant_client, embedding_list)
-
-    if not chunk_hits:
-        logger.debug("No chunk hits from Qdrant for vibe search")
-        return []
+async def chunk_hits_to_matches(
+    chunk_hits: list[ChunkHit],
+    *,
+    session: AsyncSession,
+    max_results: int,
+    exact_match_track_id: uuid.UUID | None = None,
+) -> list[VibeMatch]:
+    """Aggregate chunk hits to ranked VibeMatch results.
 
-    # 4. Aggregate chunks to track-level scores
+    Aggregates chunk scores to track level, applies the vibe match
+    threshold, limits to max_results, and joins track metadata from
+    PostgreSQL. Shared by run_vibe_lane and the batched evaluation path.
+    """
+    # Aggregate chunks to track-level scores
     track_results = aggregate_chunk_hits(
         chunk_hits=chunk_hits,
         exact_match_track_id=exact_match_track_id,
@@ -113,7 +162,7 @@ async def run_vibe_lane(
     if not track_results:
         return []
 
-    # 5. Filter by threshold
+    # Filter by threshold
     threshold = settings.vibe_match_threshold
     filtered_results = [r for r in track_results if r.final_score >= threshold]
 
@@ -125,14 +174,14 @@ async def run_vibe_lane(
         )
         return []
 
-    # 6. Limit to max_results
+    # Limit to max_results
     limited_results = filtered_results[:max_results]
 
-    # 7. Look up track metadata from PostgreSQL
+    # Look up track metadata from PostgreSQL
     track_ids = [r.track_id for r in limited_results]
     tracks_by_id = await _get_tracks_by_ids(session, track_ids)
 
-    # 8. Build VibeMatch responses, maintaining aggregated ranking order
+    # Build VibeMatch responses, maintaining aggregated ranking order
     vibe_matches: list[VibeMatch] = []
     for result in limited_results:
         track = tracks_by_id.get(result.track_id)
@@ -187,9 +236,18 @@ async def _query_qdrant(
         logger.exception("Qdrant query failed for vibe search")
         return []
 
+    return parse_chunk_hits(search_results.points)
+
+
+def parse_chunk_hits(points: list[models.ScoredPoint]) -> list[ChunkHit]:
+    """Parse Qdrant scored points into ChunkHit records.
+
+    Points with a missing or malformed track_id payload are skipped with
+    a warning.
+    """
     chunk_hits: list[ChunkHit] = []
 
-    for point in search_results.points:
+    for point in points:
         payload = point.payload or {}
         track_id_str = payload.get("track_id")
         if track_id_str is None:
@@ -31,6 +31,10 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: str | None = None
     qdrant_collection_name: str = "audio_embeddings"
+    # gRPC port for bulk/batch clients (protobuf skips the HTTP JSON
+    # serialization that can stall the event loop). Matches
+    # QDRANT__SERVICE__GRPC_PORT in docker-compose.yml.
+    qdrant_grpc_port: int = 6334
 
     # Audio storage
     audio_storage_root: str = "./data"
@@ -39,6 +43,13 @@ class Settings(BaseSettings):
     olaf_lmdb_path: str = "./data/olaf_db"
     olaf_bin_path: str = "olaf_c"
 
+    # Chromaprint
+    # Fingerprint via libchromaprint (ctypes) instead of an fpcalc
+    # subprocess per track. Off by default: environments without the
+    # shared library fall back to fpcalc anyway, and unit tests mock the
+    # subprocess path.
+    chromaprint_native: bool = False
+
     # Embedding
     embedding_model: str = "clap-htsat-large"
     embedding_dim: int = 512
@@ -15,23 +15,17 @@ import json
 import logging
 import math
 import sys
-from collections import defaultdict
 from datetime import UTC, datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, TypedDict
-
-# ---------------------------------------------------------------------------
-# Type definitions
-# ---------------------------------------------------------------------------
-
-
-class RatingEntry(TypedDict):
-    """A single rating entry for a query result."""
-
-    rank: int
-    score: int
-    similarity: float
+from typing import Any, TextIO
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -81,6 +75,26 @@ NO_GO = {
     "latency_p95": 15000.0,
 }
 
+# Metric families that can be selected via --sections
+ALL_SECTIONS = frozenset({"exact", "vibe", "latency"})
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _load_json(path: Path) -> Any:
+    """Decode a JSON file, preferring orjson when installed.
+
+    Reads the whole file in one call; both decoders are faster on a bytes
+    buffer than on an incremental file object.
+    """
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 # ---------------------------------------------------------------------------
 # Vibe metrics from human ratings
@@ -95,11 +109,12 @@ def compute_vibe_metrics(rating_path: Path) -> dict[str, Any] | None:
     if not rating_path.exists():
         return None
 
-    # Parse ratings
-    ratings_by_query: dict[str, list[RatingEntry]] = defaultdict(list)
-    rated_count = 0
+    # Parse ratings into a flat (query_key, rank, score) row list.
+    rows: list[tuple[str, int, int]] = []
 
-    with open(rating_path) as f:
+    # 1 MiB buffer: rating sheets can run to megabytes, and the default
+    # 8 KiB buffer means a syscall every few hundred rows.
+    with open(rating_path, encoding="utf-8", newline="", buffering=1 << 20) as f:
         reader = csv.DictReader(f)
         for row in reader:
             score_str = row.get("human_score", "").strip()
@@ -111,85 +126,72 @@ def compute_vibe_metrics(rating_path: Path) -> dict[str, Any] | None:
             except ValueError:
                 continue
 
-            rated_count += 1
             query_key = row.get("query_path", "") or row.get("query_label", "")
             rank = int(row.get("result_rank", 0))
+            rows.append((query_key, rank, score))
 
-            ratings_by_query[query_key].append(
-                RatingEntry(
-                    rank=rank,
-                    score=score,
-                    similarity=float(row.get("result_similarity", 0)),
-                )
-            )
-
+    rated_count = len(rows)
     if rated_count == 0:
         return None
 
-    # Compute MRR (Mean Reciprocal Rank)
-    # Position of first result scored >= 4
-    reciprocal_ranks: list[float] = []
-    for _query, results in ratings_by_query.items():
-        results_sorted = sorted(results, key=lambda x: x["rank"])
-        found = False
-        for r in results_sorted:
-            if r["score"] >= 4:
-                reciprocal_ranks.append(1.0 / r["rank"])
-                found = True
-                break
-        if not found:
-            reciprocal_ranks.append(0.0)
-
-    mrr = sum(reciprocal_ranks) / len(reciprocal_ranks) if reciprocal_ranks else 0.0
-
-    # Compute nDCG@5
-    ndcg_values: list[float] = []
-    for _query, results in ratings_by_query.items():
-        results_sorted = sorted(results, key=lambda x: x["rank"])[:5]
-        ndcg = _compute_ndcg(results_sorted, k=5)
-        ndcg_values.append(ndcg)
-
-    ndcg_at_5 = sum(ndcg_values) / len(ndcg_values) if ndcg_values else 0.0
-
-    # Compute playlist-worthy rate (fraction of top-5 results scored >= 4)
+    # One sort by (query, rank), then stream per-query groups with groupby.
+    # This replaces the dict-of-lists grouping and the per-query sorts, and
+    # lets MRR, nDCG@5, and the playlist-worthy rate share a single pass.
+    rows.sort(key=itemgetter(0, 1))
+
+    n_queries = 0
+    rr_sum = 0.0
+    ndcg_sum = 0.0
     total_top5 = 0
     worthy_count = 0
-    for _query, results in ratings_by_query.items():
-        results_sorted = sorted(results, key=lambda x: x["rank"])[:5]
-        for r in results_sorted:
-            total_top5 += 1
-            if r["score"] >= 4:
-                worthy_count += 1
 
+    for _query, group in groupby(rows, key=itemgetter(0)):
+        results = list(group)
+        n_queries += 1
+
+        # MRR: smallest rank with a human score >= 4.
+        best_rank = min((rank for _q, rank, score in results if score >= 4), default=0)
+        if best_rank:
+            rr_sum += 1.0 / best_rank
+
+        # nDCG@5 and playlist-worthy rate over the top-5 by rank.
+        top5_scores = tuple(score for _q, _rank, score in results[:5])
+        ndcg_sum += _compute_ndcg(top5_scores, k=5)
+        total_top5 += len(top5_scores)
+        worthy_count += sum(1 for s in top5_scores if s >= 4)
+
+    mrr = rr_sum / n_queries if n_queries else 0.0
+    ndcg_at_5 = ndcg_sum / n_queries if n_queries else 0.0
     playlist_worthy_rate = worthy_count / total_top5 if total_top5 > 0 else 0.0
 
     return {
         "mrr": round(mrr, 4),
         "ndcg_at_5": round(ndcg_at_5, 4),
         "playlist_worthy_rate": round(playlist_worthy_rate, 4),
-        "num_queries_rated": len(ratings_by_query),
+        "num_queries_rated": n_queries,
         "num_ratings": rated_count,
     }
 
 
-def _compute_ndcg(results: list[RatingEntry], k: int = 5) -> float:
-    """Compute nDCG@k from a list of ranked results with human scores.
+@lru_cache(maxsize=4096)
+def _compute_ndcg(scores: tuple[int, ...], k: int = 5) -> float:
+    """Compute nDCG@k from human scores ordered by result rank ascending.
 
-    Assumes results are sorted by rank ascending.
+    Scores are small integers (1-5) and k=5, so the number of distinct
+    inputs is bounded; memoizing collapses the per-query log2 work to one
+    computation per score pattern.
     """
-    if not results:
+    if not scores:
         return 0.0
 
     # DCG (position-based: positions 1..k)
     dcg = 0.0
-    for i, r in enumerate(results[:k]):
-        score = r["score"]
+    for i, score in enumerate(scores[:k]):
         dcg += float(score) / math.log2(i + 2)  # i+2 because log2(1)=0
 
     # Ideal DCG (sort by score descending, same position-based indexing)
-    ideal_scores = sorted([r["score"] for r in results[:k]], reverse=True)
     idcg = 0.0
-    for i, score in enumerate(ideal_scores):
+    for i, score in enumerate(sorted(scores[:k], reverse=True)):
         idcg += float(score) / math.log2(i + 2)
 
     return dcg / idcg if idcg > 0 else 0.0
@@ -200,363 +202,348 @@ def _compute_ndcg(results: list[RatingEntry], k: int = 5) -> float:
 # ---------------------------------------------------------------------------
 
 
-def generate_report(corpus_dir: Path) -> str:
-    """Generate the evaluation report as Markdown.
+def generate_report(
+    corpus_dir: Path,
+    sections: frozenset[str] = ALL_SECTIONS,
+    out: TextIO | None = None,
+) -> None:
+    """Write the evaluation report as Markdown to ``out``.
 
-    Returns the report text.
+    Only the metric families named in ``sections`` (a subset of
+    ``ALL_SECTIONS``) are loaded and reported; deselected families skip
+    their input parse entirely.
+
+    Lines are streamed to ``out`` (default: stdout) as they are produced,
+    so no full copy of the report is held in memory.
     """
+    if out is None:
+        out = sys.stdout
     # Load exact metrics
     exact_metrics: dict[str, Any] | None = None
-    exact_path = corpus_dir / "exact_metrics.json"
-    if exact_path.exists():
-        with open(exact_path) as f:
-            exact_metrics = json.load(f)
+    if "exact" in sections:
+        exact_path = corpus_dir / "exact_metrics.json"
+        if exact_path.exists():
+            exact_metrics = _load_json(exact_path)
 
     # Load latency metrics
     latency_metrics: dict[str, Any] | None = None
-    latency_path = corpus_dir / "latency_metrics.json"
-    if latency_path.exists():
-        with open(latency_path) as f:
-            latency_metrics = json.load(f)
+    if "latency" in sections:
+        latency_path = corpus_dir / "latency_metrics.json"
+        if latency_path.exists():
+            latency_metrics = _load_json(latency_path)
 
     # Compute vibe metrics from ratings
-    vibe_metrics = compute_vibe_metrics(corpus_dir / "vibe_rating_sheet.csv")
+    vibe_metrics = None
+    if "vibe" in sections:
+        vibe_metrics = compute_vibe_metrics(corpus_dir / "vibe_rating_sheet.csv")
 
     # Load corpus metadata
     corpus_meta: dict[str, Any] = {}
     meta_path = corpus_dir / "corpus_metadata.json"
     if meta_path.exists():
-        with open(meta_path) as f:
-            corpus_meta = json.load(f)
+        corpus_meta = _load_json(meta_path)
 
     # Build report
-    lines: list[str] = []
-    pass_count = 0
-    fail_count = 0
+    write = out.write
+
+    def emit(line: str) -> None:
+        write(line)
+        write("\n")
+
+    check_results: list[bool] = []
     no_go_triggered = False
     improvements_needed: list[str] = []
 
+    def check(
+        label: str,
+        target_text: str,
+        value_text: str,
+        passed: bool,
+        improvement: str | None = None,
+    ) -> None:
+        """Emit one metric row and record its outcome."""
+        check_results.append(passed)
+        if not passed and improvement:
+            improvements_needed.append(improvement)
+        status = "PASS" if passed else "FAIL"
+        emit(f"| {label} | {target_text} | {value_text} | {status} |")
+
     # Header
     now = datetime.now(UTC).strftime("%Y-%m-%d")
     total_tracks = corpus_meta.get("total_library_tracks", "?")
     clips_extracted = corpus_meta.get("clips_extracted", "?")
 
-    lines.append("# v1 Evaluation Report\n")
-    lines.append(f"Date: {now}")
-    lines.append(f"Library size: {total_tracks} tracks")
-    lines.append(f"Evaluation corpus: {clips_extracted} clips")
-    lines.append("")
+    emit("# v1 Evaluation Report\n")
+    emit(f"Date: {now}")
+    emit(f"Library size: {total_tracks} tracks")
+    emit(f"Evaluation corpus: {clips_extracted} clips")
+    emit("")
 
     # ------------- Exact ID Results -----------
 
-    lines.append("## Exact ID Results\n")
+    if "exact" in sections:
+        emit("## Exact ID Results\n")
 
-    if exact_metrics is None:
-        lines.append("*No exact evaluation results found. Run `make eval-exact` first.*\n")
-    else:
-        by_type = exact_metrics.get("by_type", {})
-
-        lines.append("| Metric | Target | Actual | Status |")
-        lines.append("|--------|--------|--------|--------|")
-
-        # Clean top-1
-        clean = by_type.get("clean", {})
-        if clean:
-            val = clean.get("top1_accuracy", 0)
-            target = EXACT_TARGETS["top1_clean"]
-            passed = val >= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-                improvements_needed.append(
-                    f"Clean clip top-1 accuracy ({val:.1%}) below target ({target:.0%})"
+        if exact_metrics is None:
+            emit("*No exact evaluation results found. Run `make eval-exact` first.*\n")
+        else:
+            # Bind the nested breakdown dicts once; they are consulted by several
+            # check blocks (and the NO-GO section) below.
+            by_type = exact_metrics.get("by_type", {})
+            clean = by_type.get("clean", {})
+            mic = by_type.get("mic", {})
+            browser = by_type.get("browser", {})
+            negative = by_type.get("negative", {})
+
+            emit("| Metric | Target | Actual | Status |")
+            emit("|--------|--------|--------|--------|")
+
+            # Accuracy rows: (label, source dict, key, target, improvement template)
+            accuracy_rows: list[tuple[str, dict[str, Any], str, float, str | None]] = [
+                (
+                    "Top-1 accuracy (clean)",
+                    clean,
+                    "top1_accuracy",
+                    EXACT_TARGETS["top1_clean"],
+                    "Clean clip top-1 accuracy ({val:.1%}) below target ({target:.0%})",
+                ),
+                (
+                    "Top-1 accuracy (mic)",
+                    mic,
+                    "top1_accuracy",
+                    EXACT_TARGETS["top1_mic"],
+                    "Mic top-1 accuracy ({val:.1%}) below target ({target:.0%}). Consider denoising or sub-window tuning.",
+                ),
+                (
+                    "Top-1 accuracy (browser)",
+                    browser,
+                    "top1_accuracy",
+                    EXACT_TARGETS["top1_browser"],
+                    "Browser top-1 accuracy ({val:.1%}) below target ({target:.0%})",
+                ),
+                (
+                    "Top-5 accuracy (mic)",
+                    mic,
+                    "top5_accuracy",
+                    EXACT_TARGETS["top5_mic"],
+                    None,
+                ),
+            ]
+            for label, source, key, target, note in accuracy_rows:
+                if not source:
+                    continue
+                val = source.get(key, 0)
+                check(
+                    label,
+                    f">={target:.0%}",
+                    f"{val:.1%}",
+                    val >= target,
+                    note.format(val=val, target=target) if note else None,
                 )
-            if val < NO_GO["exact_clean_top1"]:
+
+            if clean and clean.get("top1_accuracy", 0) < NO_GO["exact_clean_top1"]:
                 no_go_triggered = True
-            lines.append(f"| Top-1 accuracy (clean) | >={target:.0%} | {val:.1%} | {status} |")
-
-        # Mic top-1
-        mic = by_type.get("mic", {})
-        if mic:
-            val = mic.get("top1_accuracy", 0)
-            target = EXACT_TARGETS["top1_mic"]
-            passed = val >= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-                improvements_needed.append(
-                    f"Mic top-1 accuracy ({val:.1%}) below target ({target:.0%}). Consider denoising or sub-window tuning."
-                )
-            lines.append(f"| Top-1 accuracy (mic) | >={target:.0%} | {val:.1%} | {status} |")
-
-        # Browser top-1
-        browser = by_type.get("browser", {})
-        if browser:
-            val = browser.get("top1_accuracy", 0)
-            target = EXACT_TARGETS["top1_browser"]
-            passed = val >= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-                improvements_needed.append(
-                    f"Browser top-1 accuracy ({val:.1%}) below target ({target:.0%})"
-                )
-            lines.append(f"| Top-1 accuracy (browser) | >={target:.0%} | {val:.1%} | {status} |")
-
-        # Mic top-5
-        if mic:
-            val = mic.get("top5_accuracy", 0)
-            target = EXACT_TARGETS["top5_mic"]
-            passed = val >= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-            lines.append(f"| Top-5 accuracy (mic) | >={target:.0%} | {val:.1%} | {status} |")
-
-        # Offset error
-        if clean:
-            oe = clean.get("offset_error_median")
-            if oe is not None:
-                target = EXACT_TARGETS["offset_error_median"]
-                passed = oe <= target
-                status = "PASS" if passed else "FAIL"
-                if passed:
-                    pass_count += 1
-                else:
-                    fail_count += 1
-                lines.append(f"| Offset error (median) | <{target}s | {oe:.3f}s | {status} |")
-
-        # False positive rate
-        negative = by_type.get("negative", {})
-        if negative:
-            val = negative.get("false_positive_rate", 0)
-            target = EXACT_TARGETS["false_positive_rate"]
-            passed = val <= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-                improvements_needed.append(
-                    f"False positive rate ({val:.1%}) above target ({target:.0%}). Adjust MIN_ALIGNED_HASHES."
-                )
-            lines.append(f"| False positive rate | <={target:.0%} | {val:.1%} | {status} |")
-
-        # Query latency (exact lane only)
-        p95 = exact_metrics.get("latency_p95_ms")
-        if p95 is not None:
-            target = EXACT_TARGETS["query_latency_p95"]
-            passed = p95 <= target
-            status = "PASS" if passed else "FAIL"
-            if passed:
-                pass_count += 1
-            else:
-                fail_count += 1
-            lines.append(f"| Query latency (p95) | <={target:.0f}ms | {p95:.0f}ms | {status} |")
-
-        # Random baseline
-        rb1 = exact_metrics.get("random_baseline_top1", 0)
-        rb5 = exact_metrics.get("random_baseline_top5", 0)
-        lines.append(f"\nRandom baseline: top-1 = {rb1:.4f}%, top-5 = {rb5:.4f}%")
-
-        # Environment breakdown
-        by_env = exact_metrics.get("by_environment", {})
-        if by_env:
-            lines.append("\n### Environment Breakdown (mic recordings)\n")
-            lines.append("| Environment | Top-1 | Top-5 | Count |")
-            lines.append("|-------------|-------|-------|-------|")
-            for env, em in by_env.items():
-                lines.append(
-                    f"| {env} | {em.get('top1_accuracy', 0):.1%} | "
-                    f"{em.get('top5_accuracy', 0):.1%} | {em.get('count', 0)} |"
-                )
 
-        # Browser breakdown
-        by_browser = exact_metrics.get("by_browser", {})
-        if by_browser:
-            lines.append("\n### Browser Breakdown\n")
-            lines.append("| Browser/Device | Top-1 | Top-5 | Count |")
-            lines.append("|----------------|-------|-------|-------|")
-            for dev, dm in by_browser.items():
-                lines.append(
-                    f"| {dev} | {dm.get('top1_accuracy', 0):.1%} | "
-                    f"{dm.get('top5_accuracy', 0):.1%} | {dm.get('count', 0)} |"
+            # Offset error
+            if clean:
+                oe = clean.get("offset_error_median")
+                if oe is not None:
+                    target = EXACT_TARGETS["offset_error_median"]
+                    check("Offset error (median)", f"<{target}s", f"{oe:.3f}s", oe <= target)
+
+            # False positive rate
+            if negative:
+                val = negative.get("false_positive_rate", 0)
+                target = EXACT_TARGETS["false_positive_rate"]
+                check(
+                    "False positive rate",
+                    f"<={target:.0%}",
+                    f"{val:.1%}",
+                    val <= target,
+                    f"False positive rate ({val:.1%}) above target ({target:.0%}). Adjust MIN_ALIGNED_HASHES.",
                 )
 
-    lines.append("")
+            # Query latency (exact lane only)
+            p95 = exact_metrics.get("latency_p95_ms")
+            if p95 is not None:
+                target = EXACT_TARGETS["query_latency_p95"]
+                check("Query latency (p95)", f"<={target:.0f}ms", f"{p95:.0f}ms", p95 <= target)
+
+            # Random baseline
+            rb1 = exact_metrics.get("random_baseline_top1", 0)
+            rb5 = exact_metrics.get("random_baseline_top5", 0)
+            emit(f"\nRandom baseline: top-1 = {rb1:.4f}%, top-5 = {rb5:.4f}%")
+
+            # Environment breakdown
+            by_env = exact_metrics.get("by_environment", {})
+            if by_env:
+                emit("\n### Environment Breakdown (mic recordings)\n")
+                emit("| Environment | Top-1 | Top-5 | Count |")
+                emit("|-------------|-------|-------|-------|")
+                for env, em in by_env.items():
+                    g = em.get
+                    emit(
+                        f"| {env} | {g('top1_accuracy', 0):.1%} | "
+                        f"{g('top5_accuracy', 0):.1%} | {g('count', 0)} |"
+                    )
+
+            # Browser breakdown
+            by_browser = exact_metrics.get("by_browser", {})
+            if by_browser:
+                emit("\n### Browser Breakdown\n")
+                emit("| Browser/Device | Top-1 | Top-5 | Count |")
+                emit("|----------------|-------|-------|-------|")
+                for dev, dm in by_browser.items():
+                    g = dm.get
+                    emit(
+                        f"| {dev} | {g('top1_accuracy', 0):.1%} | "
+                        f"{g('top5_accuracy', 0):.1%} | {g('count', 0)} |"
+                    )
+
+        emit("")
 
     # ------------- Vibe Results -----------
 
-    lines.append("## Vibe Results\n")
+    if "vibe" in sections:
+        emit("## Vibe Results\n")
 
-    if vibe_metrics is None:
-        lines.append(
-            "*No vibe ratings found. Run `make eval-vibe`, fill in human_score in "
-            "vibe_rating_sheet.csv, then re-run `make eval-report`.*\n"
-        )
-    else:
-        lines.append("| Metric | Target | Actual | Status |")
-        lines.append("|--------|--------|--------|--------|")
-
-        mrr = vibe_metrics.get("mrr", 0)
-        mrr_target = VIBE_TARGETS["mrr"]
-        mrr_passed = mrr >= mrr_target
-        mrr_status = "PASS" if mrr_passed else "FAIL"
-        if mrr_passed:
-            pass_count += 1
-        else:
-            fail_count += 1
-            improvements_needed.append(
-                f"Vibe MRR ({mrr:.3f}) below target ({mrr_target}). Try different aggregation parameters."
+        if vibe_metrics is None:
+            emit(
+                "*No vibe ratings found. Run `make eval-vibe`, fill in human_score in "
+                "vibe_rating_sheet.csv, then re-run `make eval-report`.*\n"
             )
-        if mrr < NO_GO["vibe_mrr"]:
-            no_go_triggered = True
-        lines.append(f"| MRR | >={mrr_target} | {mrr:.4f} | {mrr_status} |")
-
-        ndcg = vibe_metrics.get("ndcg_at_5", 0)
-        ndcg_target = VIBE_TARGETS["ndcg_at_5"]
-        ndcg_passed = ndcg >= ndcg_target
-        ndcg_status = "PASS" if ndcg_passed else "FAIL"
-        if ndcg_passed:
-            pass_count += 1
         else:
-            fail_count += 1
-        lines.append(f"| nDCG@5 | >={ndcg_target} | {ndcg:.4f} | {ndcg_status} |")
-
-        pwr = vibe_metrics.get("playlist_worthy_rate", 0)
-        pwr_target = VIBE_TARGETS["playlist_worthy_rate"]
-        pwr_passed = pwr >= pwr_target
-        pwr_status = "PASS" if pwr_passed else "FAIL"
-        if pwr_passed:
-            pass_count += 1
-        else:
-            fail_count += 1
-        lines.append(f"| Playlist-worthy rate | >={pwr_target:.0%} | {pwr:.1%} | {pwr_status} |")
+            emit("| Metric | Target | Actual | Status |")
+            emit("|--------|--------|--------|--------|")
+
+            mrr = vibe_metrics.get("mrr", 0)
+            mrr_target = VIBE_TARGETS["mrr"]
+            check(
+                "MRR",
+                f">={mrr_target}",
+                f"{mrr:.4f}",
+                mrr >= mrr_target,
+                f"Vibe MRR ({mrr:.3f}) below target ({mrr_target}). Try different aggregation parameters.",
+            )
+            if mrr < NO_GO["vibe_mrr"]:
+                no_go_triggered = True
 
-        lines.append(
-            f"\n*Based on {vibe_metrics.get('num_queries_rated', 0)} rated queries, "
-            f"{vibe_metrics.get('num_ratings', 0)} total ratings.*"
-        )
-        lines.append(
-            "\n*Note: Single-rater evaluation accepted for v1. "
-            "Multi-rater evaluation with Krippendorff's alpha is a v2 enhancement.*"
-        )
+            ndcg = vibe_metrics.get("ndcg_at_5", 0)
+            ndcg_target = VIBE_TARGETS["ndcg_at_5"]
+            check("nDCG@5", f">={ndcg_target}", f"{ndcg:.4f}", ndcg >= ndcg_target)
+
+            pwr = vibe_metrics.get("playlist_worthy_rate", 0)
+            pwr_target = VIBE_TARGETS["playlist_worthy_rate"]
+            check("Playlist-worthy rate", f">={pwr_target:.0%}", f"{pwr:.1%}", pwr >= pwr_target)
+
+            emit(
+                f"\n*Based on {vibe_metrics.get('num_queries_rated', 0)} rated queries, "
+                f"{vibe_metrics.get('num_ratings', 0)} total ratings.*"
+            )
+            emit(
+                "\n*Note: Single-rater evaluation accepted for v1. "
+                "Multi-rater evaluation with Krippendorff's alpha is a v2 enhancement.*"
+            )
 
-    lines.append("")
+        emit("")
 
     # ------------- E2E Latency -----------
 
-    lines.append("## E2E Latency\n")
+    if "latency" in sections:
+        emit("## E2E Latency\n")
 
-    if latency_metrics is None:
-        lines.append("*No latency results found. Run `make eval-latency` first.*\n")
-    else:
-        lines.append("| Metric | Target | Actual | Status |")
-        lines.append("|--------|--------|--------|--------|")
-
-        p50 = latency_metrics.get("p50_ms", 0)
-        p50_target = LATENCY_TARGETS["p50_ms"]
-        p50_passed = p50 <= p50_target
-        p50_status = "PASS" if p50_passed else "FAIL"
-        if p50_passed:
-            pass_count += 1
-        else:
-            fail_count += 1
-        lines.append(f"| p50 | <{p50_target:.0f}ms | {p50:.0f}ms | {p50_status} |")
-
-        p95 = latency_metrics.get("p95_ms", 0)
-        p95_target = LATENCY_TARGETS["p95_ms"]
-        p95_passed = p95 <= p95_target
-        p95_status = "PASS" if p95_passed else "FAIL"
-        if p95_passed:
-            pass_count += 1
+        if latency_metrics is None:
+            emit("*No latency results found. Run `make eval-latency` first.*\n")
         else:
-            fail_count += 1
-            improvements_needed.append(
-                f"E2E p95 latency ({p95:.0f}ms) above target ({p95_target:.0f}ms). Profile and optimize bottleneck."
-            )
-        if p95 > NO_GO["latency_p95"]:
-            no_go_triggered = True
-        lines.append(f"| p95 | <{p95_target:.0f}ms | {p95:.0f}ms | {p95_status} |")
-
-        p99 = latency_metrics.get("p99_ms", 0)
-        p99_target = LATENCY_TARGETS["p99_ms"]
-        p99_passed = p99 <= p99_target
-        p99_status = "PASS" if p99_passed else "FAIL"
-        if p99_passed:
-            pass_count += 1
-        else:
-            fail_count += 1
-        lines.append(f"| p99 | <{p99_target:.0f}ms | {p99:.0f}ms | {p99_status} |")
+            emit("| Metric | Target | Actual | Status |")
+            emit("|--------|--------|--------|--------|")
+
+            latency_rows: list[tuple[str, str, float, str | None]] = [
+                ("p50", "p50_ms", LATENCY_TARGETS["p50_ms"], None),
+                (
+                    "p95",
+                    "p95_ms",
+                    LATENCY_TARGETS["p95_ms"],
+                    "E2E p95 latency ({val:.0f}ms) above target ({target:.0f}ms). Profile and optimize bottleneck.",
+                ),
+                ("p99", "p99_ms", LATENCY_TARGETS["p99_ms"], None),
+            ]
+            for label, key, target, note in latency_rows:
+                val = latency_metrics.get(key, 0)
+                check(
+                    label,
+                    f"<{target:.0f}ms",
+                    f"{val:.0f}ms",
+                    val <= target,
+                    note.format(val=val, target=target) if note else None,
+                )
 
-    lines.append("")
+            if latency_metrics.get("p95_ms", 0) > NO_GO["latency_p95"]:
+                no_go_triggered = True
+
+        emit("")
 
     # ------------- Decision -----------
 
-    lines.append("## Decision\n")
+    emit("## Decision\n")
+
+    # Tally once, after all checks have run.
+    pass_count = sum(check_results)
+    fail_count = len(check_results) - pass_count
 
     if no_go_triggered:
-        lines.append("- [ ] GO")
-        lines.append("- [ ] CONDITIONAL GO")
-        lines.append("- [x] **NO-GO** -- fundamental issues require re-architecture")
-        lines.append("")
-        lines.append("### NO-GO Triggers\n")
+        emit("- [ ] GO")
+        emit("- [ ] CONDITIONAL GO")
+        emit("- [x] **NO-GO** -- fundamental issues require re-architecture")
+        emit("")
+        emit("### NO-GO Triggers\n")
         if exact_metrics:
-            clean = exact_metrics.get("by_type", {}).get("clean", {})
+            # `clean` was bound in the exact-metrics section above.
             if clean and clean.get("top1_accuracy", 0) < NO_GO["exact_clean_top1"]:
-                lines.append(
+                emit(
                     f"- Exact ID clean clip accuracy < {NO_GO['exact_clean_top1']:.0%} -- fingerprinting engine is broken"
                 )
         if vibe_metrics and vibe_metrics.get("mrr", 0) < NO_GO["vibe_mrr"]:
-            lines.append(
+            emit(
                 f"- Vibe MRR < {NO_GO['vibe_mrr']} -- embedding model is not capturing music similarity"
             )
         if latency_metrics and latency_metrics.get("p95_ms", 0) > NO_GO["latency_p95"]:
-            lines.append(f"- E2E p95 > {NO_GO['latency_p95']:.0f}ms -- architecture does not scale")
+            emit(f"- E2E p95 > {NO_GO['latency_p95']:.0f}ms -- architecture does not scale")
     elif fail_count == 0:
-        lines.append("- [x] **GO** -- system meets quality bars for wider use")
-        lines.append("- [ ] CONDITIONAL GO")
-        lines.append("- [ ] NO-GO")
+        emit("- [x] **GO** -- system meets quality bars for wider use")
+        emit("- [ ] CONDITIONAL GO")
+        emit("- [ ] NO-GO")
     else:
-        lines.append("- [ ] GO")
-        lines.append(
+        emit("- [ ] GO")
+        emit(
             f"- [x] **CONDITIONAL GO** -- meets most bars; "
             f"{fail_count} metric(s) need improvement (see below)"
         )
-        lines.append("- [ ] NO-GO")
+        emit("- [ ] NO-GO")
 
-    lines.append(f"\n**Score: {pass_count} PASS / {fail_count} FAIL**\n")
+    emit(f"\n**Score: {pass_count} PASS / {fail_count} FAIL**\n")
 
     # ------------- Improvements -----------
 
     if improvements_needed:
-        lines.append("## Recommended Improvements\n")
-        lines.append(
+        emit("## Recommended Improvements\n")
+        emit(
             "*CONDITIONAL GO requires a follow-up sprint of max 5 days "
             "addressing these improvements:*\n"
         )
         for i, imp in enumerate(improvements_needed, 1):
-            lines.append(f"{i}. {imp}")
-        lines.append("")
+            emit(f"{i}. {imp}")
+        emit("")
 
     # ------------- Parameter Tuning -----------
 
-    lines.append("## Parameter Tuning Opportunities\n")
-    lines.append("1. Adjust `MIN_ALIGNED_HASHES` threshold based on ROC curve (exact lane)")
-    lines.append("2. Adjust `VIBE_MATCH_THRESHOLD` based on human eval scores (vibe lane)")
-    lines.append("3. Enable denoising for noisy environments if accuracy < target")
-    lines.append("4. Tune Qdrant `hnsw_ef` parameter for latency vs. recall tradeoff")
-    lines.append("")
+    emit("## Parameter Tuning Opportunities\n")
+    emit("1. Adjust `MIN_ALIGNED_HASHES` threshold based on ROC curve (exact lane)")
+    emit("2. Adjust `VIBE_MATCH_THRESHOLD` based on human eval scores (vibe lane)")
+    emit("3. Enable denoising for noisy environments if accuracy < target")
+    emit("4. Tune Qdrant `hnsw_ef` parameter for latency vs. recall tradeoff")
+    emit("")
 
-    return "\n".join(lines)
 
 
 # ---------------------------------------------------------------------------
@@ -575,6 +562,16 @@ def parse_args() -> argparse.Namespace:
         default=Path("eval_corpus"),
         help="Directory containing evaluation results (default: eval_corpus).",
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not echo the report to stdout (for CI pipelines).",
+    )
+    parser.add_argument(
+        "--sections",
+        default=",".join(sorted(ALL_SECTIONS)),
+        help="Comma-separated metric families to report: exact, vibe, latency (default: all).",
+    )
     return parser.parse_args()
 
 
@@ -586,14 +583,22 @@ def main() -> None:
         logger.error("Corpus directory does not exist: %s", args.corpus_dir)
         sys.exit(1)
 
-    report = generate_report(args.corpus_dir)
+    sections = frozenset(s.strip() for s in args.sections.split(",") if s.strip())
+    unknown = sections - ALL_SECTIONS
+    if unknown:
+        logger.error("Unknown section(s): %s", ", ".join(sorted(unknown)))
+        sys.exit(1)
 
-    # Write report
+    # Stream the report straight to the file; no full-report string is
+    # ever materialized.
     report_path = args.corpus_dir / "evaluation-report.md"
-    report_path.write_text(report)
+    with report_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        generate_report(args.corpus_dir, sections, out=f)
 
-    # Print summary to stdout
-    print(report)
+    # Echo to stdout only for interactive use; a single write avoids
+    # per-line flushes, and piped/CI callers get just the log line.
+    if not args.quiet and sys.stdout.isatty():
+        sys.stdout.write(report_path.read_text())
 
     logger.info("Full report written to: %s", report_path)
 
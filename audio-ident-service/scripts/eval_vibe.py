@@ -14,19 +14,23 @@ from __future__ import annotations
 import argparse
 import asyncio
 import csv
+import functools
 import logging
-import statistics
+import os
+import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, cast
 
-from qdrant_client import AsyncQdrantClient
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
 
-from app.audio.decode import decode_to_pcm
-from app.audio.embedding import load_clap_model
+from app.audio.decode import AudioDecodeError, decode_to_pcm_path
+from app.audio.embedding import generate_embedding_batch, load_clap_model
 from app.db.session import async_session_factory
-from app.search.vibe import run_vibe_lane
+from app.search.vibe import chunk_hits_to_matches, parse_chunk_hits
 from app.settings import settings
 
 # ---------------------------------------------------------------------------
@@ -49,8 +53,42 @@ logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 # ---------------------------------------------------------------------------
 
 DEFAULT_MAX_RESULTS = 10
+DEFAULT_CONCURRENCY = 8
+
+# Queries per CLAP forward pass. Batching the [B, T] forward amortizes
+# kernel-launch and attention overhead; gains flatten past ~8-16 on CPU.
+DEFAULT_CLAP_BATCH = 8
+
+# Qdrant batch tuning: ~16 queries per batch with 2 batches in flight is
+# the throughput sweet spot before per-batch latency starts climbing.
+DEFAULT_QDRANT_BATCH_SIZE = 16
+DEFAULT_QDRANT_INFLIGHT = 2
 AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".ogg", ".m4a", ".webm", ".opus"}
 
+# CSV column orders. Module-level so row tuples can be built in place
+# and written with csv.writer (no per-row dict field resolution).
+RESULTS_FIELDS = (
+    "query_path",
+    "query_label",
+    "query_type",
+    "result_rank",
+    "result_track_id",
+    "result_title",
+    "result_artist",
+    "result_similarity",
+    "latency_ms",
+)
+RATING_FIELDS = (
+    "query_path",
+    "query_label",
+    "result_rank",
+    "result_track_id",
+    "result_title",
+    "result_artist",
+    "result_similarity",
+    "human_score",
+)
+
 # Vibe evaluation targets (from plan)
 TARGETS = {
     "mrr": 0.5,
@@ -64,56 +102,173 @@ TARGETS = {
 # ---------------------------------------------------------------------------
 
 
-async def evaluate_vibe_query(
+def _decode_sync(audio_path: str, target_sample_rate: int) -> bytes:
+    """Synchronous ffmpeg decode for use in a ProcessPoolExecutor worker.
+
+    Mirrors app.audio.decode.decode_to_pcm_path (f32le output) but
+    blocks, so the pipe shuffling happens in the worker process instead
+    of on the event loop. ffmpeg reads the source file itself — the
+    compressed audio is never held in Python memory nor pickled to the
+    worker.
+    """
+    proc = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            audio_path,
+            "-ar",
+            str(target_sample_rate),
+            "-ac",
+            "1",
+            "-f",
+            "f32le",
+            "-acodec",
+            "pcm_f32le",
+            "pipe:1",
+        ],
+        capture_output=True,
+    )
+
+    if proc.returncode != 0:
+        err_msg = proc.stderr.decode(errors="replace").strip()
+        raise AudioDecodeError(f"ffmpeg exited with code {proc.returncode}: {err_msg}")
+
+    if not proc.stdout:
+        raise AudioDecodeError("ffmpeg produced no output")
+
+    return proc.stdout
+
+
+async def decode_vibe_query(
     audio_path: Path,
-    max_results: int,
     *,
-    qdrant_client: AsyncQdrantClient,
-    clap_model: object,
-    clap_processor: object,
+    decode_pool: ProcessPoolExecutor | None = None,
 ) -> dict[str, object]:
-    """Run a single vibe query and return results.
+    """Phase 1a: decode a single query to 48kHz f32le PCM.
 
-    Returns a dict with matches, latency, or error info.
-    """
-    try:
-        audio_data = audio_path.read_bytes()
-    except OSError as exc:
-        logger.error("Could not read %s: %s", audio_path, exc)
-        return {"error": str(exc), "matches": [], "latency_ms": 0.0}
+    When a decode_pool is given, the ffmpeg decode runs in a worker
+    process so decodes scale across cores alongside CLAP inference.
+    Either way ffmpeg reads the file from disk directly, so memory stays
+    constant regardless of source file size.
 
+    Returns a dict with the PCM bytes (None on failure) and error info.
+    """
     try:
-        pcm_48k = await decode_to_pcm(audio_data, target_sample_rate=48000)
+        if decode_pool is not None:
+            loop = asyncio.get_running_loop()
+            pcm_48k = await loop.run_in_executor(
+                decode_pool, _decode_sync, str(audio_path), 48000
+            )
+        else:
+            pcm_48k = await decode_to_pcm_path(audio_path, target_sample_rate=48000)
     except Exception as exc:
         logger.error("Decode failed for %s: %s", audio_path, exc)
-        return {"error": f"decode: {exc}", "matches": [], "latency_ms": 0.0}
+        return {"error": f"decode: {exc}", "pcm": None}
 
-    t0 = time.perf_counter()
-    try:
-        async with async_session_factory() as session:
-            matches = await run_vibe_lane(
-                pcm_48k,
-                max_results,
-                qdrant_client=qdrant_client,
-                clap_model=clap_model,
-                clap_processor=clap_processor,
-                session=session,
+    return {"pcm": pcm_48k, "error": None}
+
+
+async def _batched_vibe_search(
+    embed_results: list[dict[str, object]],
+    qdrant_client: AsyncQdrantClient,
+    max_results: int,
+    batch_size: int = DEFAULT_QDRANT_BATCH_SIZE,
+    inflight: int = DEFAULT_QDRANT_INFLIGHT,
+) -> list[dict[str, object]]:
+    """Phase 2: resolve all embedded queries via batched Qdrant calls.
+
+    Chunks the embedded vectors into ``query_batch_points`` requests of
+    ``batch_size`` with at most ``inflight`` batches on the wire at once
+    (one network round-trip per batch instead of one per query). Chunk
+    hits are then aggregated and joined with track metadata per query.
+    Per-query latency_ms is the query's embed time plus its batch's
+    search wall time. Per-batch wall times are logged so the batch size
+    can be re-tuned per cluster.
+    """
+    eval_results: list[dict[str, object]] = []
+    for r in embed_results:
+        eval_results.append(
+            {"matches": [], "latency_ms": r.get("embed_ms", 0.0), "error": r.get("error")}
+        )
+
+    embedded_idx = [i for i, r in enumerate(embed_results) if r.get("vector") is not None]
+    if not embedded_idx:
+        return eval_results
+
+    batches = [embedded_idx[j : j + batch_size] for j in range(0, len(embedded_idx), batch_size)]
+    batch_sem = asyncio.Semaphore(inflight)
+    # Per-query batch wall time, filled in by each batch task.
+    search_ms: dict[int, float] = {}
+
+    async def run_batch(batch_num: int, batch: list[int]) -> None:
+        requests = [
+            models.QueryRequest(
+                query=cast(Any, embed_results[i]["vector"]).tolist(),
+                limit=settings.qdrant_search_limit,
+                with_payload=True,
+                params=models.SearchParams(hnsw_ef=128),
             )
-    except Exception as exc:
-        logger.error("Vibe lane failed for %s: %s", audio_path, exc)
-        return {
-            "error": f"vibe_lane: {exc}",
-            "matches": [],
-            "latency_ms": (time.perf_counter() - t0) * 1000,
-        }
+            for i in batch
+        ]
+
+        async with batch_sem:
+            t0 = time.perf_counter()
+            try:
+                responses = await qdrant_client.query_batch_points(
+                    collection_name=settings.qdrant_collection_name,
+                    requests=requests,
+                )
+            except Exception as exc:
+                logger.error("Qdrant batch %d failed: %s", batch_num, exc)
+                for i in batch:
+                    eval_results[i]["error"] = f"qdrant_batch: {exc}"
+                return
+            batch_ms = (time.perf_counter() - t0) * 1000
+
+        logger.info(
+            "Qdrant batch %d/%d: %d queries in %.1fms",
+            batch_num + 1,
+            len(batches),
+            len(requests),
+            batch_ms,
+        )
+
+        for i, response in zip(batch, responses, strict=True):
+            eval_results[i]["points"] = response.points
+            search_ms[i] = batch_ms
+
+    await asyncio.gather(*(run_batch(n, b) for n, b in enumerate(batches)))
+
+    # Aggregate and join metadata sequentially, in query order. One
+    # session spans the whole pass: the per-query pool checkout/return
+    # would otherwise dominate the small metadata lookups.
+    async with async_session_factory() as session:
+        for i in embedded_idx:
+            points = cast(list[Any] | None, eval_results[i].pop("points", None))
+            if points is None:
+                continue
 
-    latency_ms = (time.perf_counter() - t0) * 1000
+            chunk_hits = parse_chunk_hits(points)
+            try:
+                matches = await chunk_hits_to_matches(
+                    chunk_hits,
+                    session=session,
+                    max_results=max_results,
+                )
+            except Exception as exc:
+                logger.error("Match aggregation failed for query %d: %s", i, exc)
+                eval_results[i]["error"] = f"aggregate: {exc}"
+                continue
+
+            eval_results[i]["matches"] = matches
+            eval_results[i]["latency_ms"] = (
+                cast(float, eval_results[i]["latency_ms"]) + search_ms[i]
+            )
 
-    return {
-        "matches": matches,
-        "latency_ms": latency_ms,
-        "error": None,
-    }
+    return eval_results
 
 
 async def run_evaluation(
@@ -121,15 +276,29 @@ async def run_evaluation(
     query_dir: Path | None,
     max_results: int,
     query_type: str | None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    qdrant_batch_size: int = DEFAULT_QDRANT_BATCH_SIZE,
+    qdrant_inflight: int = DEFAULT_QDRANT_INFLIGHT,
+    clap_batch: int = DEFAULT_CLAP_BATCH,
+    compile_clap: bool = True,
+    device: str | None = None,
 ) -> None:
     """Run the full vibe evaluation."""
-    # Load CLAP model once
+    # Load CLAP model once; compile by default since the eval amortizes
+    # the warm-up cost over many queries. Device defaults to CUDA when
+    # available (corpus sweeps are where the GPU pays off most).
     logger.info("Loading CLAP model (this may take a moment)...")
-    clap_model, clap_processor = load_clap_model()
+    clap_model, clap_processor = load_clap_model(optimize=compile_clap, device=device)
     logger.info("CLAP model loaded.")
 
-    # Initialize Qdrant client
-    qdrant_client = AsyncQdrantClient(url=settings.qdrant_url)
+    # Initialize Qdrant client. gRPC + protobuf skips the HTTP JSON
+    # encode/decode of the large batched query payloads, which would
+    # otherwise run on (and stall) the event loop.
+    qdrant_client = AsyncQdrantClient(
+        url=settings.qdrant_url,
+        prefer_grpc=True,
+        grpc_port=settings.qdrant_grpc_port,
+    )
 
     # Build query list
     queries = _build_query_list(corpus_dir, query_dir, query_type)
@@ -138,12 +307,24 @@ async def run_evaluation(
         logger.error("No queries found. Check corpus-dir or query-dir.")
         sys.exit(1)
 
-    logger.info("Running %d vibe queries (max_results=%d)...", len(queries), max_results)
+    logger.info(
+        "Running %d vibe queries (max_results=%d, concurrency=%d)...",
+        len(queries),
+        max_results,
+        concurrency,
+    )
 
-    # Run queries
-    all_results: list[dict[str, str]] = []
-    rating_rows: list[dict[str, str]] = []
-    errors: list[str] = []
+    # Phase 1: decode queries concurrently (bounded by a semaphore) and
+    # feed decoded PCM through a bounded queue to a CLAP microbatch
+    # consumer. One [B, T] forward per batch amortizes kernel-launch and
+    # attention overhead; the queue bound keeps decoded PCM memory flat.
+    embed_results: list[dict[str, object]] = [
+        {"vector": None, "embed_ms": 0.0, "error": None} for _ in queries
+    ]
+    sem = asyncio.Semaphore(concurrency)
+    embed_queue: asyncio.Queue[tuple[int, np.ndarray] | None] = asyncio.Queue(
+        maxsize=max(clap_batch * 2, concurrency)
+    )
 
     try:
         from rich.progress import Progress
@@ -152,117 +333,188 @@ async def run_evaluation(
     except ImportError:
         progress_ctx = None
 
-    async def process_query(query: dict[str, str], idx: int) -> None:
-        audio_path = Path(query["audio_path"])
-        query_label = query.get("label", audio_path.stem)
-
-        eval_result = await evaluate_vibe_query(
-            audio_path,
-            max_results,
-            qdrant_client=qdrant_client,
-            clap_model=clap_model,
-            clap_processor=clap_processor,
-        )
-
-        if eval_result.get("error"):
-            errors.append(f"{audio_path}: {eval_result['error']}")
-
-        matches: list[Any] = cast(list[Any], eval_result["matches"])
+    decode_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
 
-        # Store per-query result
-        for rank, match in enumerate(matches):
-            all_results.append(
-                {
-                    "query_path": str(audio_path),
-                    "query_label": query_label,
-                    "query_type": query.get("type", ""),
-                    "result_rank": str(rank + 1),
-                    "result_track_id": str(match.track.id),
-                    "result_title": match.track.title,
-                    "result_artist": match.track.artist or "",
-                    "result_similarity": f"{match.similarity:.4f}",
-                    "latency_ms": f"{eval_result['latency_ms']:.1f}",
-                }
+    async def produce(query: dict[str, str], idx: int) -> None:
+        async with sem:
+            decoded = await decode_vibe_query(
+                Path(query["audio_path"]),
+                decode_pool=decode_pool,
             )
 
-            # Add to rating sheet
-            rating_rows.append(
-                {
-                    "query_path": str(audio_path),
-                    "query_label": query_label,
-                    "result_rank": str(rank + 1),
-                    "result_track_id": str(match.track.id),
-                    "result_title": match.track.title,
-                    "result_artist": match.track.artist or "",
-                    "result_similarity": f"{match.similarity:.4f}",
-                    "human_score": "",  # Empty for rater to fill
-                }
-            )
+        pcm = decoded.get("pcm")
+        if pcm is None:
+            embed_results[idx]["error"] = decoded.get("error")
+            return
+
+        audio = np.frombuffer(cast(bytes, pcm), dtype=np.float32)
+        if audio.size == 0:
+            embed_results[idx]["error"] = "embed: empty audio"
+            return
+
+        await embed_queue.put((idx, audio))
+
+    async def consume() -> None:
+        loop = asyncio.get_running_loop()
+        batch: list[tuple[int, np.ndarray]] = []
+
+        async def flush() -> None:
+            nonlocal batch
+            if not batch:
+                return
+            arrays = [audio for _, audio in batch]
+            t0 = time.perf_counter()
+            try:
+                vectors = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        generate_embedding_batch, arrays, clap_model, clap_processor
+                    ),
+                )
+            except Exception as exc:
+                logger.error("CLAP batch embed failed: %s", exc)
+                for i, _ in batch:
+                    embed_results[i]["error"] = f"embed: {exc}"
+                batch = []
+                return
+            # Attribute the batch wall time evenly across its members.
+            per_query_ms = (time.perf_counter() - t0) * 1000 / len(batch)
+            for (i, _), vector in zip(batch, vectors, strict=True):
+                embed_results[i]["vector"] = vector
+                embed_results[i]["embed_ms"] = per_query_ms
+            batch = []
+
+        while True:
+            item = await embed_queue.get()
+            if item is None:
+                await flush()
+                return
+            batch.append(item)
+            if len(batch) >= clap_batch:
+                await flush()
 
-        if not matches:
-            all_results.append(
-                {
-                    "query_path": str(audio_path),
-                    "query_label": query_label,
-                    "query_type": query.get("type", ""),
-                    "result_rank": "0",
-                    "result_track_id": "",
-                    "result_title": "(no results)",
-                    "result_artist": "",
-                    "result_similarity": "0.0",
-                    "latency_ms": f"{eval_result['latency_ms']:.1f}",
-                }
-            )
+    try:
+        consumer_task = asyncio.create_task(consume())
+        if progress_ctx:
+            with progress_ctx as progress:
+                task = progress.add_task("Decode + CLAP embedding", total=len(queries))
 
-    if progress_ctx:
-        with progress_ctx as progress:
-            task = progress.add_task("Vibe evaluation", total=len(queries))
-            for i, query in enumerate(queries):
-                await process_query(query, i)
-                progress.advance(task)
-    else:
-        for i, query in enumerate(queries):
-            if (i + 1) % 10 == 0 or i == 0:
-                logger.info("Processing query %d/%d...", i + 1, len(queries))
-            await process_query(query, i)
-
-    # Write results CSV
-    results_path = corpus_dir / "vibe_results.csv"
-    _write_csv(
-        all_results,
-        results_path,
-        fieldnames=[
-            "query_path",
-            "query_label",
-            "query_type",
-            "result_rank",
-            "result_track_id",
-            "result_title",
-            "result_artist",
-            "result_similarity",
-            "latency_ms",
-        ],
+                async def tracked(query: dict[str, str], idx: int) -> None:
+                    await produce(query, idx)
+                    progress.advance(task)
+
+                await asyncio.gather(*(tracked(q, i) for i, q in enumerate(queries)))
+        else:
+            await asyncio.gather(*(produce(q, i) for i, q in enumerate(queries)))
+        await embed_queue.put(None)
+        await consumer_task
+    finally:
+        decode_pool.shutdown()
+
+    # Phase 2: one server-side batched Qdrant query for all embedded
+    # vectors, then per-query aggregation and metadata join.
+    eval_results = await _batched_vibe_search(
+        embed_results,
+        qdrant_client,
+        max_results,
+        batch_size=qdrant_batch_size,
+        inflight=qdrant_inflight,
     )
 
-    # Write rating sheet
+    # Stream rows straight to the CSV writers, sequentially in query order
+    # so the CSVs stay deterministic regardless of task completion order.
+    # Keeps memory bounded: only summary scalars are retained, not the
+    # full row dicts.
+    results_path = corpus_dir / "vibe_results.csv"
     rating_path = corpus_dir / "vibe_rating_sheet.csv"
-    _write_csv(
-        rating_rows,
-        rating_path,
-        fieldnames=[
-            "query_path",
-            "query_label",
-            "result_rank",
-            "result_track_id",
-            "result_title",
-            "result_artist",
-            "result_similarity",
-            "human_score",
-        ],
-    )
+
+    errors: list[str] = []
+    all_similarities: list[float] = []
+    queries_with_results = 0
+
+    with (
+        open(results_path, "w", newline="") as results_f,
+        open(rating_path, "w", newline="") as rating_f,
+    ):
+        # QUOTE_MINIMAL lets the C writer fast-path the all-numeric
+        # columns; only titles/artists containing delimiters get quoted.
+        results_writer = csv.writer(results_f, quoting=csv.QUOTE_MINIMAL)
+        results_writer.writerow(RESULTS_FIELDS)
+
+        rating_writer = csv.writer(rating_f, quoting=csv.QUOTE_MINIMAL)
+        rating_writer.writerow(RATING_FIELDS)
+
+        for idx, query in enumerate(queries):
+            audio_path = str(Path(query["audio_path"]))
+            query_label = query.get("label", Path(audio_path).stem)
+            query_type_str = query.get("type", "")
+            eval_result = eval_results[idx]
+            latency_str = f"{eval_result['latency_ms']:.1f}"
+
+            if eval_result.get("error"):
+                errors.append(f"{audio_path}: {eval_result['error']}")
+
+            matches: list[Any] = cast(list[Any], eval_result["matches"])
+
+            if matches:
+                queries_with_results += 1
+
+            # Write per-query result rows (column order: RESULTS_FIELDS /
+            # RATING_FIELDS)
+            for rank, match in enumerate(matches):
+                similarity_str = f"{match.similarity:.4f}"
+                all_similarities.append(float(similarity_str))
+
+                rank_str = str(rank + 1)
+                track_id_str = str(match.track.id)
+                title = match.track.title
+                artist = match.track.artist or ""
+
+                results_writer.writerow(
+                    (
+                        audio_path,
+                        query_label,
+                        query_type_str,
+                        rank_str,
+                        track_id_str,
+                        title,
+                        artist,
+                        similarity_str,
+                        latency_str,
+                    )
+                )
+
+                # Rating sheet row; human_score left empty for the rater
+                rating_writer.writerow(
+                    (
+                        audio_path,
+                        query_label,
+                        rank_str,
+                        track_id_str,
+                        title,
+                        artist,
+                        similarity_str,
+                        "",
+                    )
+                )
+
+            if not matches:
+                results_writer.writerow(
+                    (
+                        audio_path,
+                        query_label,
+                        query_type_str,
+                        "0",
+                        "",
+                        "(no results)",
+                        "",
+                        "0.0",
+                        latency_str,
+                    )
+                )
 
     # Print summary
-    _print_summary(all_results, errors, queries)
+    _print_summary(all_similarities, queries_with_results, errors, queries)
 
     await qdrant_client.close()
 
@@ -286,16 +538,22 @@ def _build_query_list(
     queries: list[dict[str, str]] = []
 
     if query_dir is not None and query_dir.is_dir():
-        # Use audio files in query_dir
-        for audio_file in sorted(query_dir.iterdir()):
-            if audio_file.suffix.lower() in AUDIO_EXTENSIONS:
-                queries.append(
-                    {
-                        "audio_path": str(audio_file),
-                        "label": audio_file.stem,
-                        "type": "query",
-                    }
-                )
+        # Use audio files in query_dir. One scandir pass: the dirent
+        # already carries the file type, so no extra stat per entry.
+        with os.scandir(query_dir) as entries:
+            audio_names = sorted(
+                entry.name
+                for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS
+            )
+        for name in audio_names:
+            queries.append(
+                {
+                    "audio_path": str(query_dir / name),
+                    "label": os.path.splitext(name)[0],
+                    "type": "query",
+                }
+            )
         logger.info("Found %d audio files in query dir: %s", len(queries), query_dir)
         return queries
 
@@ -305,6 +563,23 @@ def _build_query_list(
         logger.error("No ground_truth.csv found and no --query-dir specified.")
         return []
 
+    # Existence checks via one scandir per referenced directory instead
+    # of a stat syscall per row; large corpora on network filesystems
+    # otherwise spend startup in stat calls.
+    existing_by_dir: dict[Path, set[str]] = {}
+
+    def _exists(path: Path) -> bool:
+        parent = path.parent
+        names = existing_by_dir.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                names = set()
+            existing_by_dir[parent] = names
+        return path.name in names
+
     with open(gt_path) as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -317,7 +592,7 @@ def _build_query_list(
                 continue
 
             audio_path = corpus_dir / row["clip_path"]
-            if audio_path.exists():
+            if _exists(audio_path):
                 queries.append(
                     {
                         "audio_path": str(audio_path),
@@ -330,45 +605,18 @@ def _build_query_list(
     return queries
 
 
-def _write_csv(
-    rows: list[dict[str, str]],
-    path: Path,
-    fieldnames: list[str],
-) -> None:
-    """Write rows to CSV."""
-    with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-
 def _print_summary(
-    results: list[dict[str, Any]],
+    all_similarities: list[float],
+    with_results: int,
     errors: list[str],
     queries: list[dict[str, str]],
 ) -> None:
-    """Print a human-readable summary."""
+    """Print a human-readable summary from the streamed aggregates."""
     print("\n" + "=" * 70)
     print("VIBE EVALUATION SUMMARY")
     print("=" * 70)
 
-    # Count queries with/without results
-    queries_with_results: set[str] = set()
-    queries_without_results: set[str] = set()
-    all_similarities: list[float] = []
-
-    for r in results:
-        rank = int(r.get("result_rank", 0))
-        qpath = str(r.get("query_path", ""))
-        if rank == 0:
-            queries_without_results.add(qpath)
-        else:
-            queries_with_results.add(qpath)
-            sim = float(r.get("result_similarity", 0))
-            all_similarities.append(sim)
-
     total_queries = len(queries)
-    with_results = len(queries_with_results)
     without_results = total_queries - with_results
 
     print(f"\nTotal queries: {total_queries}")
@@ -376,11 +624,12 @@ def _print_summary(
     print(f"  Without results: {without_results}")
 
     if all_similarities:
+        sims = np.asarray(all_similarities, dtype=np.float64)
         print("\nSimilarity scores (across all results):")
-        print(f"  Mean: {statistics.mean(all_similarities):.4f}")
-        print(f"  Median: {statistics.median(all_similarities):.4f}")
-        print(f"  Min: {min(all_similarities):.4f}")
-        print(f"  Max: {max(all_similarities):.4f}")
+        print(f"  Mean: {sims.mean():.4f}")
+        print(f"  Median: {np.median(sims):.4f}")
+        print(f"  Min: {sims.min():.4f}")
+        print(f"  Max: {sims.max():.4f}")
 
     if errors:
         print(f"\nErrors ({len(errors)}):")
@@ -433,6 +682,41 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Filter ground_truth.csv by type (e.g., 'clean', 'mic'). Only used without --query-dir.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Max queries evaluated concurrently (default: {DEFAULT_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--qdrant-batch-size",
+        type=int,
+        default=DEFAULT_QDRANT_BATCH_SIZE,
+        help=f"Queries per Qdrant batch request (default: {DEFAULT_QDRANT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--qdrant-inflight",
+        type=int,
+        default=DEFAULT_QDRANT_INFLIGHT,
+        help=f"Max Qdrant batch requests in flight (default: {DEFAULT_QDRANT_INFLIGHT}).",
+    )
+    parser.add_argument(
+        "--clap-batch",
+        type=int,
+        default=DEFAULT_CLAP_BATCH,
+        help=f"Queries per CLAP forward pass (default: {DEFAULT_CLAP_BATCH}).",
+    )
+    parser.add_argument(
+        "--no-compile-clap",
+        action="store_true",
+        help="Skip torch.compile of the CLAP model (faster startup, slower per-query embed).",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default=None,
+        help="Torch device for CLAP inference, e.g. 'cuda' or 'cpu' (default: auto-detect).",
+    )
     return parser.parse_args()
 
 
@@ -448,6 +732,12 @@ def main() -> None:
             query_dir=args.query_dir,
             max_results=args.max_results,
             query_type=args.query_type,
+            concurrency=args.concurrency,
+            qdrant_batch_size=args.qdrant_batch_size,
+            qdrant_inflight=args.qdrant_inflight,
+            clap_batch=args.clap_batch,
+            compile_clap=not args.no_compile_clap,
+            device=args.device,
         )
     )
 
@@ -1,11 +1,43 @@
+from collections.abc import Generator
+from unittest.mock import MagicMock
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def client() -> AsyncClient:
+    """One AsyncClient per test module.
+
+    The ASGI transport holds no per-test state and every consumer makes
+    idempotent requests, so rebuilding the transport and client for each
+    test is pure overhead.
+    """
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture(scope="session")
+def stub_clap() -> Generator[tuple[MagicMock, MagicMock], None, None]:
+    """Stub transformers CLAP loading for the whole session.
+
+    Patches ClapModel/ClapProcessor.from_pretrained once instead of
+    re-entering nested patch context managers per test. Yields the
+    (model, processor) stubs that load_clap_model will return. Opt-in:
+    request the fixture explicitly.
+    """
+    import transformers
+
+    mock_model = MagicMock()
+    mock_processor = MagicMock()
+
+    mp = pytest.MonkeyPatch()
+    mp.setattr(transformers.ClapModel, "from_pretrained", lambda *args, **kwargs: mock_model)
+    mp.setattr(
+        transformers.ClapProcessor, "from_pretrained", lambda *args, **kwargs: mock_processor
+    )
+    yield mock_model, mock_processor
+    mp.undo()
@@ -1,9 +1,10 @@
 """Tests for app.audio.decode module."""
 
 import io
-import struct
 import wave
+from pathlib import Path
 
+import numpy as np
 import pytest
 
 from app.audio.decode import (
@@ -11,6 +12,7 @@ from app.audio.decode import (
     decode_and_validate,
     decode_dual_rate,
     decode_to_pcm,
+    decode_to_pcm_path,
     pcm_duration_seconds,
 )
 
@@ -25,8 +27,6 @@ def _make_wav_bytes(
 
     Returns raw bytes of a valid WAV file.
     """
-    import math
-
     num_frames = int(sample_rate * duration_seconds)
     buf = io.BytesIO()
 
@@ -35,24 +35,22 @@ def _make_wav_bytes(
         wf.setsampwidth(sample_width)
         wf.setframerate(sample_rate)
 
-        frames = bytearray()
-        for i in range(num_frames):
-            # Generate a 440 Hz sine wave
-            sample = int(16000 * math.sin(2 * math.pi * 440 * i / sample_rate))
-            frames.extend(struct.pack("<h", sample))
-
-        wf.writeframes(bytes(frames))
+        # 440 Hz sine wave, generated in one vectorized pass
+        samples = (
+            16000 * np.sin(2 * np.pi * 440 * np.arange(num_frames) / sample_rate)
+        ).astype("<i2")
+        wf.writeframes(samples.tobytes())
 
     return buf.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def wav_1s() -> bytes:
     """A 1-second WAV file at 44.1kHz mono."""
     return _make_wav_bytes(duration_seconds=1.0)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def wav_5s() -> bytes:
     """A 5-second WAV file at 44.1kHz mono."""
     return _make_wav_bytes(duration_seconds=5.0)
@@ -90,6 +88,20 @@ class TestDecodeTopcm:
             await decode_to_pcm(b"not audio data at all", target_sample_rate=16000)
 
 
+class TestDecodeToPcmPath:
+    async def test_decode_file_to_48k_f32le(self, wav_1s: bytes, tmp_path: Path) -> None:
+        wav_path = tmp_path / "test.wav"
+        wav_path.write_bytes(wav_1s)
+        pcm = await decode_to_pcm_path(wav_path, target_sample_rate=48000)
+        assert isinstance(pcm, bytes)
+        expected_bytes = 48000 * 4
+        assert abs(len(pcm) - expected_bytes) < expected_bytes * 0.05
+
+    async def test_decode_missing_file_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(AudioDecodeError):
+            await decode_to_pcm_path(tmp_path / "missing.mp3", target_sample_rate=16000)
+
+
 class TestDecodeDualRate:
     async def test_returns_two_outputs(self, wav_1s: bytes) -> None:
         pcm_16k, pcm_48k = await decode_dual_rate(wav_1s)
@@ -1,6 +1,7 @@
 """Tests for CLAP embedding generation (app.audio.embedding)."""
 
-from unittest.mock import MagicMock, patch
+import functools
+from unittest.mock import MagicMock
 
 import numpy as np
 import pytest
@@ -20,31 +21,57 @@ from app.audio.embedding import (
 )
 
 
+@functools.lru_cache(maxsize=32)
 def _make_pcm_bytes(duration_sec: float, sample_rate: int = SAMPLE_RATE) -> bytes:
-    """Create PCM float32 bytes of given duration at given sample rate."""
+    """Create PCM float32 bytes of given duration at given sample rate.
+
+    Cached per (duration, rate): many tests request identical durations
+    and the buffers are immutable bytes.
+    """
     num_samples = int(duration_sec * sample_rate)
-    # Generate a sine wave so it's not all zeros
-    t = np.linspace(0, duration_sec, num_samples, dtype=np.float32)
-    audio = np.sin(2 * np.pi * 440 * t).astype(np.float32)
-    return audio.tobytes()
+    # Generate a sine wave so it's not all zeros; stay in float32
+    # throughout (no float64 linspace intermediate)
+    audio = np.sin(np.arange(num_samples, dtype=np.float32) * (2 * np.pi * 440 / sample_rate))
+    return audio.astype(np.float32).tobytes()
+
+
+# Shared random audio input, drawn once as float32 (no float64
+# intermediate) since the tests never inspect the sample values. The 5s
+# buffer is a zero-copy view of the 10s one.
+_RAND_AUDIO_10S = np.random.default_rng(0).standard_normal(SAMPLE_RATE * 10, dtype=np.float32)
+_RAND_AUDIO_5S = _RAND_AUDIO_10S[: SAMPLE_RATE * 5]
+
+# Preallocated tensors returned by reference from the mocks: the tests
+# assert only shapes, so per-call torch.randn allocations are wasted
+# work. Sized for the largest batch any test produces (6 chunks for 30s).
+_MAX_MOCK_BATCH = 8
+_FAKE_EMBED = torch.empty((_MAX_MOCK_BATCH, 512), dtype=torch.float32)
+_FAKE_FEATURES = torch.empty((_MAX_MOCK_BATCH, 1, 1001, 64), dtype=torch.float32)
+_FAKE_HIDDEN = torch.empty((1, 10, 512), dtype=torch.float32)
 
 
 def _make_mock_model(embedding_dim: int = 512) -> MagicMock:
-    """Create a mock CLAP model that returns a 512-dim tensor."""
+    """Create a mock CLAP model that returns one 512-dim row per input.
+
+    Mirrors the batch contract of the real model: get_audio_features on
+    [N, ...] input features returns an [N, dim] tensor.
+    """
     model = MagicMock()
     model.eval = MagicMock(return_value=model)
 
-    def mock_get_audio_features(**kwargs: object) -> torch.Tensor:
-        return torch.randn(1, embedding_dim)
+    def mock_get_audio_features(input_features: torch.Tensor, **kwargs: object) -> torch.Tensor:
+        if embedding_dim == 512:
+            return _FAKE_EMBED[: input_features.shape[0]]
+        return torch.empty(input_features.shape[0], embedding_dim)
 
     model.get_audio_features = MagicMock(side_effect=mock_get_audio_features)
     return model
 
 
 def _make_mock_processor() -> MagicMock:
-    """Create a mock CLAP processor."""
+    """Create a mock CLAP processor whose batch size tracks its input."""
     processor = MagicMock()
-    processor.return_value = {"input_features": torch.randn(1, 1, 1001, 64)}
+    processor.side_effect = lambda audio, **kwargs: {"input_features": _FAKE_FEATURES[: len(audio)]}
     return processor
 
 
@@ -54,16 +81,38 @@ def _make_mock_processor() -> MagicMock:
 
 
 class TestChunkAudio:
-    def test_30s_audio_expected_chunks(self) -> None:
-        """30s audio with 10s window and 5s hop produces 5 chunks.
+    @pytest.mark.parametrize(
+        ("duration_sec", "expected_count", "expected_durations"),
+        [
+            # 30s: chunks at 0, 5, 10, 15, 20, 25s (25s has 5s left >= 1s min)
+            (30.0, 6, None),
+            # Exactly one window: full 10s chunk plus a padded 5s chunk at 5s
+            (10.0, 2, [10.0, 5.0]),
+            (15.0, 3, [10.0, 10.0, 5.0]),
+            (25.0, 5, None),
+        ],
+    )
+    def test_expected_chunks(
+        self,
+        duration_sec: float,
+        expected_count: int,
+        expected_durations: list[float] | None,
+    ) -> None:
+        """Chunk count, offsets, and indices for various durations.
 
-        Offsets: 0, 5, 10, 15, 20. The chunk starting at 20 covers 20-30s.
-        The next would start at 25, which has only 5s left (>=1s min), so 6 total.
+        10s window, 5s hop: one chunk per hop while at least MIN_CHUNK_SEC
+        of audio remains.
         """
-        pcm = _make_pcm_bytes(30.0)
+        pcm = _make_pcm_bytes(duration_sec)
         chunks = chunk_audio(pcm)
-        # 0s, 5s, 10s, 15s, 20s, 25s (25s has 5s remaining >= 1s min)
-        assert len(chunks) == 6
+
+        assert len(chunks) == expected_count
+        for i, (_, offset, index, _) in enumerate(chunks):
+            assert index == i
+            assert abs(offset - i * CHUNK_HOP_SEC) < 0.01
+        if expected_durations is not None:
+            for (_, _, _, duration), expected in zip(chunks, expected_durations, strict=True):
+                assert abs(duration - expected) < 0.01
 
     def test_short_audio_below_min_returns_empty(self) -> None:
         """Audio shorter than MIN_CHUNK_SEC returns empty list."""
@@ -71,42 +120,6 @@ class TestChunkAudio:
         chunks = chunk_audio(pcm)
         assert chunks == []
 
-    def test_exactly_10s_returns_two_chunks(self) -> None:
-        """Audio exactly equal to window size produces 2 chunks.
-
-        With 5s hop: chunk at 0s (full 10s) and chunk at 5s (5s padded).
-        """
-        pcm = _make_pcm_bytes(10.0)
-        chunks = chunk_audio(pcm)
-        assert len(chunks) == 2
-        _, offset, index, duration = chunks[0]
-        assert offset == 0.0
-        assert index == 0
-        assert abs(duration - 10.0) < 0.01
-        # Second chunk starts at 5s with 5s of audio
-        _, offset2, index2, duration2 = chunks[1]
-        assert abs(offset2 - 5.0) < 0.01
-        assert index2 == 1
-        assert abs(duration2 - 5.0) < 0.01
-
-    def test_15s_returns_three_chunks(self) -> None:
-        """15s audio: chunks at 0s, 5s, 10s (three 5s hops)."""
-        pcm = _make_pcm_bytes(15.0)
-        chunks = chunk_audio(pcm)
-        assert len(chunks) == 3
-        assert chunks[0][1] == 0.0  # offset
-        assert abs(chunks[1][1] - 5.0) < 0.01  # second offset
-        assert abs(chunks[2][1] - 10.0) < 0.01  # third offset
-
-    def test_chunk_offsets_and_indices(self) -> None:
-        """Verify offset and index values for 25s audio."""
-        pcm = _make_pcm_bytes(25.0)
-        chunks = chunk_audio(pcm)
-
-        for i, (_, offset, index, _) in enumerate(chunks):
-            assert index == i
-            assert abs(offset - i * CHUNK_HOP_SEC) < 0.01
-
     def test_empty_input_returns_empty(self) -> None:
         """Empty PCM bytes returns empty list."""
         chunks = chunk_audio(b"")
@@ -146,7 +159,7 @@ class TestGenerateEmbedding:
         """generate_embedding returns a 512-dim numpy array."""
         model = _make_mock_model()
         processor = _make_mock_processor()
-        audio = np.random.randn(SAMPLE_RATE * 10).astype(np.float32)
+        audio = _RAND_AUDIO_10S
 
         result = generate_embedding(audio, model, processor)
 
@@ -156,9 +169,9 @@ class TestGenerateEmbedding:
     def test_handles_tensor_return_type(self) -> None:
         """Handles case where model returns a plain torch.Tensor."""
         model = MagicMock()
-        model.get_audio_features = MagicMock(return_value=torch.randn(1, 512))
+        model.get_audio_features = MagicMock(return_value=_FAKE_EMBED[:1])
         processor = _make_mock_processor()
-        audio = np.random.randn(SAMPLE_RATE * 5).astype(np.float32)
+        audio = _RAND_AUDIO_5S
 
         result = generate_embedding(audio, model, processor)
 
@@ -167,14 +180,14 @@ class TestGenerateEmbedding:
     def test_handles_pooler_output_return_type(self) -> None:
         """Handles case where model returns object with pooler_output."""
         mock_output = MagicMock()
-        mock_output.pooler_output = torch.randn(1, 512)
+        mock_output.pooler_output = _FAKE_EMBED[:1]
 
         model = MagicMock()
         # Make sure isinstance check for torch.Tensor fails
         model.get_audio_features = MagicMock(return_value=mock_output)
 
         processor = _make_mock_processor()
-        audio = np.random.randn(SAMPLE_RATE * 5).astype(np.float32)
+        audio = _RAND_AUDIO_5S
 
         result = generate_embedding(audio, model, processor)
 
@@ -184,13 +197,13 @@ class TestGenerateEmbedding:
         """Handles case where model returns object with last_hidden_state."""
         mock_output = MagicMock(spec=[])
         mock_output.pooler_output = None
-        mock_output.last_hidden_state = torch.randn(1, 10, 512)
+        mock_output.last_hidden_state = _FAKE_HIDDEN
 
         model = MagicMock()
         model.get_audio_features = MagicMock(return_value=mock_output)
 
         processor = _make_mock_processor()
-        audio = np.random.randn(SAMPLE_RATE * 5).astype(np.float32)
+        audio = _RAND_AUDIO_5S
 
         result = generate_embedding(audio, model, processor)
 
@@ -201,7 +214,7 @@ class TestGenerateEmbedding:
         model = MagicMock()
         model.get_audio_features = MagicMock(side_effect=RuntimeError("CUDA OOM"))
         processor = _make_mock_processor()
-        audio = np.random.randn(SAMPLE_RATE * 5).astype(np.float32)
+        audio = _RAND_AUDIO_5S
 
         with pytest.raises(EmbeddingError, match="Failed to generate embedding"):
             generate_embedding(audio, model, processor)
@@ -226,7 +239,7 @@ class TestGenerateChunkedEmbeddings:
         assert len(result) == expected_chunks
 
     def test_each_chunk_has_512_dim_embedding(self) -> None:
-        """Each AudioChunk should have a 512-element embedding list."""
+        """Each AudioChunk should carry a packed 512-dim float32 embedding."""
         model = _make_mock_model()
         processor = _make_mock_processor()
         pcm = _make_pcm_bytes(15.0)
@@ -235,8 +248,8 @@ class TestGenerateChunkedEmbeddings:
 
         for chunk in result:
             assert isinstance(chunk, AudioChunk)
-            assert len(chunk.embedding) == 512
-            assert all(isinstance(v, float) for v in chunk.embedding)
+            assert chunk.embedding.shape == (512,)
+            assert chunk.embedding.dtype == np.float32
 
     def test_metadata_preserved(self) -> None:
         """Chunk offsets, indices, and durations are correct."""
@@ -277,28 +290,13 @@ class TestGenerateChunkedEmbeddings:
 
 
 class TestLoadClapModel:
-    @patch("app.audio.embedding.ClapProcessor", create=True)
-    @patch("app.audio.embedding.ClapModel", create=True)
     def test_load_returns_model_and_processor(
-        self,
-        mock_clap_model_class: MagicMock,
-        mock_clap_processor_class: MagicMock,
+        self, stub_clap: tuple[MagicMock, MagicMock]
     ) -> None:
-        """load_clap_model returns a (model, processor) tuple."""
-        mock_model = MagicMock()
-        mock_processor = MagicMock()
-
-        with (
-            patch(
-                "transformers.ClapModel.from_pretrained",
-                return_value=mock_model,
-            ),
-            patch(
-                "transformers.ClapProcessor.from_pretrained",
-                return_value=mock_processor,
-            ),
-        ):
-            model, processor = load_clap_model()
-
-        assert model is not None
-        assert processor is not None
+        """load_clap_model returns the stubbed (model, processor) tuple."""
+        stub_model, stub_processor = stub_clap
+
+        model, processor = load_clap_model()
+
+        assert model is stub_model
+        assert processor is stub_processor
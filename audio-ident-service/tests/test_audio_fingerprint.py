@@ -1,8 +1,11 @@
 """Tests for Olaf fingerprint indexing and querying (app.audio.fingerprint)."""
 
+import tempfile
 import uuid
+from collections.abc import Callable
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from typing import IO, NamedTuple
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -23,13 +26,76 @@ from app.audio.fingerprint import (
 SAMPLE_TRACK_ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
 
 
+@pytest.fixture(autouse=True)
+def _isolated_tmp(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point tempfile at the per-test tmp_path.
+
+    olaf_index_track/olaf_query write real temp files even when the
+    subprocess is mocked. Redirecting tempfile.tempdir keeps those
+    writes off the shared /tmp directory (no cross-worker contention
+    under pytest-xdist) and lets pytest reclaim anything a mocked
+    Path.unlink leaves behind.
+    """
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+
+def _tracking_tempfile_factory(
+    tmp_path: Path, created_files: list[str]
+) -> Callable[..., IO[bytes]]:
+    """Build a NamedTemporaryFile stand-in backed by a file under tmp_path.
+
+    The returned callable opens a plain file (a context manager with the
+    ``.name``/``.write`` surface the code under test uses) and records
+    its path so tests can assert cleanup. Skips the real tempfile fd
+    machinery and leaves the file in place on close, like the
+    ``delete=False`` path.
+    """
+
+    def factory(*args: object, **kwargs: object) -> IO[bytes]:
+        f = open(tmp_path / f"olaf-{uuid.uuid4().hex}.raw", "wb")  # noqa: SIM115
+        created_files.append(f.name)
+        return f
+
+    return factory
+
+
+class OlafMocks(NamedTuple):
+    """Handles exposed by the mocked_olaf fixture."""
+
+    proc: AsyncMock
+    exec: AsyncMock
+    unlink: MagicMock
+
+
+@pytest.fixture
+def mocked_olaf(monkeypatch: pytest.MonkeyPatch) -> OlafMocks:
+    """Stub the olaf_c subprocess and temp-file unlink once per test.
+
+    Replaces the nested ``with patch(...)`` blocks repeated across the
+    subprocess tests. Tests configure the run via
+    ``mocked_olaf.proc.communicate.return_value`` / ``.returncode``; the
+    binary-not-found tests install their own ``side_effect`` instead,
+    and the temp-file cleanup tests stay off this fixture because they
+    need the real ``Path.unlink``.
+    """
+    proc = AsyncMock()
+    proc.communicate.return_value = (b"", b"")
+    proc.returncode = 0
+
+    exec_mock = AsyncMock(return_value=proc)
+    unlink_mock = MagicMock()
+    monkeypatch.setattr("app.audio.fingerprint.asyncio.create_subprocess_exec", exec_mock)
+    monkeypatch.setattr("app.audio.fingerprint.Path.unlink", unlink_mock)
+    return OlafMocks(proc, exec_mock, unlink_mock)
+
+
 @pytest.fixture
 def fake_pcm() -> bytes:
     """Minimal fake PCM data (not real audio, just non-empty bytes)."""
     return b"\x00" * 1024
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_olaf_csv() -> str:
     """Sample comma-separated output from olaf_c query."""
     return (
@@ -138,32 +204,23 @@ class TestPartsToMatch:
 
 
 class TestOlafIndexTrack:
-    async def test_index_success(self, fake_pcm: bytes) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"OK\n", b"")
-        mock_proc.returncode = 0
+    async def test_index_success(self, fake_pcm: bytes, mocked_olaf: OlafMocks) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"OK\n", b"")
 
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            result = await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
+        result = await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
         assert result is True
         # Verify olaf_c was called with "store" command
-        call_args = mock_proc.communicate.call_args
+        call_args = mocked_olaf.proc.communicate.call_args
         assert call_args is not None
 
-    async def test_index_failure_returns_false(self, fake_pcm: bytes) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"LMDB error\n")
-        mock_proc.returncode = 1
+    async def test_index_failure_returns_false(
+        self, fake_pcm: bytes, mocked_olaf: OlafMocks
+    ) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"", b"LMDB error\n")
+        mocked_olaf.proc.returncode = 1
 
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            result = await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
+        result = await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
         assert result is False
 
@@ -181,86 +238,60 @@ class TestOlafIndexTrack:
         ):
             await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
-    async def test_index_sets_olaf_db_env(self, fake_pcm: bytes) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"OK\n", b"")
-        mock_proc.returncode = 0
+    async def test_index_sets_olaf_db_env(self, fake_pcm: bytes, mocked_olaf: OlafMocks) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"OK\n", b"")
 
-        with (
-            patch(
-                "app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc
-            ) as mock_exec,
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
+        await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
         # Verify OLAF_DB was passed in the env
-        call_kwargs = mock_exec.call_args
+        call_kwargs = mocked_olaf.exec.call_args
         env = call_kwargs.kwargs.get("env") or call_kwargs[1].get("env", {})
         assert "OLAF_DB" in env
 
-    async def test_index_temp_file_cleanup_on_success(self, fake_pcm: bytes) -> None:
+    async def test_index_temp_file_cleanup_on_success(
+        self, fake_pcm: bytes, tmp_path: Path
+    ) -> None:
         """Verify temp file is cleaned up after successful indexing."""
         created_files: list[str] = []
 
-        original_named_temp = __import__("tempfile").NamedTemporaryFile
-
-        class TrackingTempFile:
-            def __init__(self, *args, **kwargs):
-                kwargs["delete"] = False
-                self._real = original_named_temp(*args, **kwargs)
-                created_files.append(self._real.name)
-
-            def __enter__(self):
-                self._real.__enter__()
-                return self._real
-
-            def __exit__(self, *args):
-                return self._real.__exit__(*args)
-
         mock_proc = AsyncMock()
         mock_proc.communicate.return_value = (b"OK\n", b"")
         mock_proc.returncode = 0
 
         with (
             patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.tempfile.NamedTemporaryFile", TrackingTempFile),
+            patch(
+                "app.audio.fingerprint.tempfile.NamedTemporaryFile",
+                _tracking_tempfile_factory(tmp_path, created_files),
+            ),
         ):
             await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
         # The temp file should have been cleaned up
+        assert created_files
         for f in created_files:
             assert not Path(f).exists(), f"Temp file {f} was not cleaned up"
 
-    async def test_index_temp_file_cleanup_on_failure(self, fake_pcm: bytes) -> None:
+    async def test_index_temp_file_cleanup_on_failure(
+        self, fake_pcm: bytes, tmp_path: Path
+    ) -> None:
         """Verify temp file is cleaned up even when olaf_c fails."""
+        created_files: list[str] = []
+
         mock_proc = AsyncMock()
         mock_proc.communicate.return_value = (b"", b"error\n")
         mock_proc.returncode = 1
 
-        created_files: list[str] = []
-
-        original_named_temp = __import__("tempfile").NamedTemporaryFile
-
-        class TrackingTempFile:
-            def __init__(self, *args, **kwargs):
-                kwargs["delete"] = False
-                self._real = original_named_temp(*args, **kwargs)
-                created_files.append(self._real.name)
-
-            def __enter__(self):
-                self._real.__enter__()
-                return self._real
-
-            def __exit__(self, *args):
-                return self._real.__exit__(*args)
-
         with (
             patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.tempfile.NamedTemporaryFile", TrackingTempFile),
+            patch(
+                "app.audio.fingerprint.tempfile.NamedTemporaryFile",
+                _tracking_tempfile_factory(tmp_path, created_files),
+            ),
         ):
             await olaf_index_track(fake_pcm, SAMPLE_TRACK_ID)
 
+        assert created_files
         for f in created_files:
             assert not Path(f).exists(), f"Temp file {f} was not cleaned up after failure"
 
@@ -271,33 +302,18 @@ class TestOlafIndexTrack:
 
 
 class TestOlafQuery:
-    async def test_query_with_results(self, fake_pcm: bytes) -> None:
+    async def test_query_with_results(self, fake_pcm: bytes, mocked_olaf: OlafMocks) -> None:
         csv_output = b"42, 0.5, 3.2, some-track, 1001, 10.0, 12.7\n"
+        mocked_olaf.proc.communicate.return_value = (csv_output, b"")
 
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (csv_output, b"")
-        mock_proc.returncode = 0
-
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            matches = await olaf_query(fake_pcm)
+        matches = await olaf_query(fake_pcm)
 
         assert len(matches) == 1
         assert matches[0].match_count == 42
         assert matches[0].reference_path == "some-track"
 
-    async def test_query_empty_results(self, fake_pcm: bytes) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
-
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            matches = await olaf_query(fake_pcm)
+    async def test_query_empty_results(self, fake_pcm: bytes, mocked_olaf: OlafMocks) -> None:
+        matches = await olaf_query(fake_pcm)
 
         assert matches == []
 
@@ -305,16 +321,13 @@ class TestOlafQuery:
         matches = await olaf_query(b"")
         assert matches == []
 
-    async def test_query_failure_returns_empty(self, fake_pcm: bytes) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"error\n")
-        mock_proc.returncode = 1
+    async def test_query_failure_returns_empty(
+        self, fake_pcm: bytes, mocked_olaf: OlafMocks
+    ) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"", b"error\n")
+        mocked_olaf.proc.returncode = 1
 
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            matches = await olaf_query(fake_pcm)
+        matches = await olaf_query(fake_pcm)
 
         assert matches == []
 
@@ -328,22 +341,17 @@ class TestOlafQuery:
         ):
             await olaf_query(fake_pcm)
 
-    async def test_query_multiple_results_sorted(self, fake_pcm: bytes) -> None:
+    async def test_query_multiple_results_sorted(
+        self, fake_pcm: bytes, mocked_olaf: OlafMocks
+    ) -> None:
         csv_output = (
             b"5, 0.0, 1.0, track-a, 1, 0.0, 1.0\n"
             b"99, 0.0, 1.0, track-b, 2, 0.0, 1.0\n"
             b"20, 0.0, 1.0, track-c, 3, 0.0, 1.0\n"
         )
+        mocked_olaf.proc.communicate.return_value = (csv_output, b"")
 
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (csv_output, b"")
-        mock_proc.returncode = 0
-
-        with (
-            patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc),
-            patch("app.audio.fingerprint.Path.unlink"),
-        ):
-            matches = await olaf_query(fake_pcm)
+        matches = await olaf_query(fake_pcm)
 
         assert [m.match_count for m in matches] == [99, 20, 5]
 
@@ -354,28 +362,21 @@ class TestOlafQuery:
 
 
 class TestOlafDeleteTrack:
-    async def test_delete_success(self) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"OK\n", b"")
-        mock_proc.returncode = 0
+    async def test_delete_success(self, mocked_olaf: OlafMocks) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"OK\n", b"")
 
-        with patch(
-            "app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc
-        ) as mock_exec:
-            result = await olaf_delete_track(SAMPLE_TRACK_ID)
+        result = await olaf_delete_track(SAMPLE_TRACK_ID)
 
         assert result is True
         # Verify "del" command was used
-        exec_args = mock_exec.call_args[0]
+        exec_args = mocked_olaf.exec.call_args[0]
         assert "del" in exec_args
 
-    async def test_delete_failure_returns_false(self) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"not found\n")
-        mock_proc.returncode = 1
+    async def test_delete_failure_returns_false(self, mocked_olaf: OlafMocks) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"", b"not found\n")
+        mocked_olaf.proc.returncode = 1
 
-        with patch("app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc):
-            result = await olaf_delete_track(SAMPLE_TRACK_ID)
+        result = await olaf_delete_track(SAMPLE_TRACK_ID)
 
         assert result is False
 
@@ -389,15 +390,10 @@ class TestOlafDeleteTrack:
         ):
             await olaf_delete_track(SAMPLE_TRACK_ID)
 
-    async def test_delete_passes_track_id_as_string(self) -> None:
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"OK\n", b"")
-        mock_proc.returncode = 0
+    async def test_delete_passes_track_id_as_string(self, mocked_olaf: OlafMocks) -> None:
+        mocked_olaf.proc.communicate.return_value = (b"OK\n", b"")
 
-        with patch(
-            "app.audio.fingerprint.asyncio.create_subprocess_exec", return_value=mock_proc
-        ) as mock_exec:
-            await olaf_delete_track(SAMPLE_TRACK_ID)
+        await olaf_delete_track(SAMPLE_TRACK_ID)
 
-        exec_args = mock_exec.call_args[0]
+        exec_args = mocked_olaf.exec.call_args[0]
         assert str(SAMPLE_TRACK_ID) in exec_args
@@ -1,40 +1,59 @@
 """Tests for app.audio.metadata module."""
 
-import math
 import struct
-import wave
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from app.audio.metadata import AudioMetadata, compute_file_hash, extract_metadata
 
+# 44-byte canonical RIFF/WAVE header for 16-bit mono PCM. Packing it
+# directly lets the fixture land in one write_bytes call instead of
+# wave.open's seek-back header patching on close.
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
 
 def _make_wav_file(
     path: Path,
     duration_seconds: float = 1.0,
     sample_rate: int = 44100,
 ) -> None:
-    """Write a minimal WAV file to disk."""
+    """Write a minimal 16-bit mono WAV file to disk."""
     num_frames = int(sample_rate * duration_seconds)
-    with wave.open(str(path), "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-
-        frames = bytearray()
-        for i in range(num_frames):
-            sample = int(16000 * math.sin(2 * math.pi * 440 * i / sample_rate))
-            frames.extend(struct.pack("<h", sample))
-
-        wf.writeframes(bytes(frames))
 
-
-@pytest.fixture
-def wav_file(tmp_path: Path) -> Path:
-    """Create a temporary WAV file and return its path."""
-    audio_path = tmp_path / "test.wav"
+    # 440 Hz sine wave, generated in one vectorized pass
+    samples = (16000 * np.sin(2 * np.pi * 440 * np.arange(num_frames) / sample_rate)).astype("<i2")
+    data = samples.tobytes()
+
+    header = _WAV_HEADER.pack(
+        b"RIFF",
+        36 + len(data),
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # mono
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        len(data),
+    )
+    path.write_bytes(header + data)
+
+
+@pytest.fixture(scope="module")
+def wav_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary WAV file once per module and return its path.
+
+    Read-only so an accidental mutation by one test cannot leak into
+    the others sharing the file.
+    """
+    audio_path = tmp_path_factory.mktemp("wav") / "test.wav"
     _make_wav_file(audio_path, duration_seconds=1.0)
+    audio_path.chmod(0o444)
     return audio_path
 
 
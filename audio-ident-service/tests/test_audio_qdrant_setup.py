@@ -1,144 +1,168 @@
 """Tests for Qdrant collection management (app.audio.qdrant_setup)."""
 
+import asyncio
+import dataclasses
 import uuid
+from collections.abc import Generator
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pytest
 from qdrant_client import models
 
 from app.audio.embedding import AudioChunk
 from app.audio.qdrant_setup import (
-    BATCH_SIZE,
     delete_track_embeddings,
     ensure_collection,
     upsert_track_embeddings,
 )
+from app.settings import settings
 
+# One shared embedding buffer for every test chunk: the tests never read
+# the values, so there is no reason to allocate 512 floats per chunk.
+_CANON_EMBED = np.arange(512, dtype=np.float32)
 
-def _make_chunks(count: int, embedding_dim: int = 512) -> list[AudioChunk]:
-    """Create a list of AudioChunks with random embeddings."""
-    chunks = []
-    for i in range(count):
-        chunks.append(
-            AudioChunk(
-                embedding=[float(x) for x in range(embedding_dim)],
-                offset_sec=i * 5.0,
-                chunk_index=i,
-                duration_sec=10.0,
-            )
-        )
-    return chunks
+# Fixed track ID: no test compares two distinct IDs, so there is no need
+# to pull kernel entropy via uuid4() in every test body.
+_TEST_TRACK_ID = uuid.UUID("00000000-0000-4000-8000-000000000001")
+
+_TEMPLATE_CHUNK = AudioChunk(
+    embedding=_CANON_EMBED,
+    offset_sec=0.0,
+    chunk_index=0,
+    duration_sec=10.0,
+)
+
+
+def _make_chunks(count: int) -> list[AudioChunk]:
+    """Clone the template chunk, varying only index and offset."""
+    return [
+        dataclasses.replace(_TEMPLATE_CHUNK, chunk_index=i, offset_sec=i * 5.0)
+        for i in range(count)
+    ]
 
 
-def _make_mock_client(collection_exists: bool = False) -> MagicMock:
-    """Create a mock Qdrant client.
+class FakeQdrant:
+    """Minimal async Qdrant client stub recording calls in plain lists.
+
+    Cheaper than an AsyncMock tree: O(1) attribute access, no lazy child
+    mocks, and no _Call bookkeeping for the 100-point upsert batches.
 
     Args:
-        collection_exists: If True, the mock returns a collection named
-            'audio_embeddings' in get_collections().
+        collection_exists: If True, get_collections() reports a
+            collection named 'audio_embeddings'.
     """
-    client = MagicMock()
-
-    # Setup get_collections response
-    collections_response = MagicMock()
-    if collection_exists:
-        existing = MagicMock()
-        existing.name = "audio_embeddings"
-        collections_response.collections = [existing]
-    else:
-        collections_response.collections = []
-
-    client.get_collections.return_value = collections_response
-    return client
 
+    def __init__(self, collection_exists: bool = False) -> None:
+        self._collection_exists = collection_exists
+        self.create_collection_calls: list[dict[str, Any]] = []
+        self.create_payload_index_calls: list[dict[str, Any]] = []
+        self.upsert_calls: list[dict[str, Any]] = []
+        self.delete_calls: list[dict[str, Any]] = []
 
-# ──────────────────────────────────────────────
-# ensure_collection tests
-# ──────────────────────────────────────────────
+    async def get_collections(self) -> SimpleNamespace:
+        collections = (
+            [SimpleNamespace(name="audio_embeddings")] if self._collection_exists else []
+        )
+        return SimpleNamespace(collections=collections)
 
+    async def create_collection(self, **kwargs: Any) -> None:
+        self.create_collection_calls.append(kwargs)
 
-class TestEnsureCollection:
-    @patch("app.audio.qdrant_setup.settings")
-    def test_creates_collection_if_not_exists(self, mock_settings: MagicMock) -> None:
-        """Creates collection when it does not exist."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-        mock_settings.embedding_dim = 512
+    async def create_payload_index(self, **kwargs: Any) -> None:
+        self.create_payload_index_calls.append(kwargs)
 
-        client = _make_mock_client(collection_exists=False)
-        ensure_collection(client)
+    async def upsert(self, **kwargs: Any) -> None:
+        self.upsert_calls.append(kwargs)
 
-        client.create_collection.assert_called_once()
-        # Verify the collection name
-        call_kwargs = client.create_collection.call_args
-        assert call_kwargs.kwargs["collection_name"] == "audio_embeddings"
+    async def delete(self, **kwargs: Any) -> None:
+        self.delete_calls.append(kwargs)
 
-    @patch("app.audio.qdrant_setup.settings")
-    def test_skips_creation_if_exists(self, mock_settings: MagicMock) -> None:
-        """Skips collection creation when it already exists."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
 
-        client = _make_mock_client(collection_exists=True)
-        ensure_collection(client)
+@pytest.fixture(autouse=True, scope="module")
+def _qdrant_settings() -> Generator[None, None, None]:
+    """Pin the settings fields qdrant_setup reads, once for the module.
 
-        client.create_collection.assert_not_called()
-
-    @patch("app.audio.qdrant_setup.settings")
-    def test_correct_vector_params(self, mock_settings: MagicMock) -> None:
-        """Verifies correct vector config: 512 dim, cosine distance."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-        mock_settings.embedding_dim = 512
+    Replaces the per-test @patch("app.audio.qdrant_setup.settings")
+    decorators, each of which rebuilt a MagicMock settings tree and
+    re-entered a patch cycle.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setattr(settings, "qdrant_collection_name", "audio_embeddings")
+    mp.setattr(settings, "embedding_dim", 512)
+    yield
+    mp.undo()
 
-        client = _make_mock_client(collection_exists=False)
-        ensure_collection(client)
 
-        call_kwargs = client.create_collection.call_args.kwargs
-        vectors_config = call_kwargs["vectors_config"]
-        assert vectors_config.size == 512
-        assert vectors_config.distance == models.Distance.COSINE
+# ──────────────────────────────────────────────
+# ensure_collection tests
+# ──────────────────────────────────────────────
 
-    @patch("app.audio.qdrant_setup.settings")
-    def test_hnsw_config(self, mock_settings: MagicMock) -> None:
-        """Verifies HNSW config: m=16, ef_construct=200."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-        mock_settings.embedding_dim = 512
 
-        client = _make_mock_client(collection_exists=False)
-        ensure_collection(client)
+@pytest.fixture(scope="module")
+def created_collection(_qdrant_settings: None) -> FakeQdrant:
+    """Run ensure_collection once and share the recorded calls.
 
-        call_kwargs = client.create_collection.call_args.kwargs
-        hnsw_config = call_kwargs["hnsw_config"]
-        assert hnsw_config.m == 16
-        assert hnsw_config.ef_construct == 200
+    The config tests only read the kwargs create_collection was called
+    with, so a single creation pass serves every assertion. The stub has
+    no event-loop affinity, so a short-lived asyncio.run is fine here.
+    """
+    client = FakeQdrant(collection_exists=False)
+    asyncio.run(ensure_collection(client))
+    return client
 
-    @patch("app.audio.qdrant_setup.settings")
-    def test_quantization_config(self, mock_settings: MagicMock) -> None:
-        """Verifies INT8 scalar quantization config."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-        mock_settings.embedding_dim = 512
 
-        client = _make_mock_client(collection_exists=False)
-        ensure_collection(client)
+class TestEnsureCollection:
+    def test_creates_collection_if_not_exists(self, created_collection: FakeQdrant) -> None:
+        """Creates collection when it does not exist."""
+        assert len(created_collection.create_collection_calls) == 1
+        # Verify the collection name
+        call_kwargs = created_collection.create_collection_calls[0]
+        assert call_kwargs["collection_name"] == "audio_embeddings"
 
-        call_kwargs = client.create_collection.call_args.kwargs
-        quant_config = call_kwargs["quantization_config"]
+    async def test_skips_creation_if_exists(self) -> None:
+        """Skips collection creation when it already exists."""
+        client = FakeQdrant(collection_exists=True)
+        await ensure_collection(client)
+
+        assert client.create_collection_calls == []
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("vectors_config.size", 512),
+            ("vectors_config.distance", models.Distance.COSINE),
+            ("hnsw_config.m", 16),
+            ("hnsw_config.ef_construct", 200),
+            ("quantization_config.scalar.type", models.ScalarType.INT8),
+            ("quantization_config.scalar.quantile", 0.99),
+            ("quantization_config.scalar.always_ram", True),
+        ],
+    )
+    def test_create_collection_config(
+        self, created_collection: FakeQdrant, path: str, expected: object
+    ) -> None:
+        """Collection schema: 512-dim cosine vectors, HNSW m=16/ef=200,
+        INT8 scalar quantization kept in RAM."""
+        head, _, rest = path.partition(".")
+        value: Any = created_collection.create_collection_calls[0][head]
+        for attr in rest.split("."):
+            value = getattr(value, attr)
+        assert value == expected
+
+    def test_quantization_config_type(self, created_collection: FakeQdrant) -> None:
+        """Quantization config is a ScalarQuantization instance."""
+        quant_config = created_collection.create_collection_calls[0]["quantization_config"]
         assert isinstance(quant_config, models.ScalarQuantization)
-        assert quant_config.scalar.type == models.ScalarType.INT8
-        assert quant_config.scalar.quantile == 0.99
-        assert quant_config.scalar.always_ram is True
 
-    @patch("app.audio.qdrant_setup.settings")
-    def test_creates_payload_indexes(self, mock_settings: MagicMock) -> None:
+    def test_creates_payload_indexes(self, created_collection: FakeQdrant) -> None:
         """Creates payload indexes on track_id and genre."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-        mock_settings.embedding_dim = 512
-
-        client = _make_mock_client(collection_exists=False)
-        ensure_collection(client)
-
         # Should create exactly 2 payload indexes
-        assert client.create_payload_index.call_count == 2
+        assert len(created_collection.create_payload_index_calls) == 2
 
-        index_calls = client.create_payload_index.call_args_list
-        field_names = [c.kwargs["field_name"] for c in index_calls]
+        field_names = [c["field_name"] for c in created_collection.create_payload_index_calls]
         assert "track_id" in field_names
         assert "genre" in field_names
 
@@ -149,140 +173,117 @@ class TestEnsureCollection:
 
 
 class TestUpsertTrackEmbeddings:
-    @patch("app.audio.qdrant_setup.settings")
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_upserts_correct_number_of_points(
+    async def test_upserts_correct_number_of_points(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
         """Upserts the correct number of points."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
         chunks = _make_chunks(5)
 
-        count = upsert_track_embeddings(client, track_id, chunks)
+        count = await upsert_track_embeddings(client, track_id, chunks)
 
         assert count == 5
-        client.upsert.assert_called_once()
+        assert len(client.upsert_calls) == 1
 
-    @patch("app.audio.qdrant_setup.settings")
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_batches_large_upserts(
+    @patch("app.audio.qdrant_setup.BATCH_SIZE", 4)
+    async def test_batches_large_upserts(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
-        """Batches correctly when more than BATCH_SIZE chunks."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
+        """Batches correctly when more than BATCH_SIZE chunks.
 
-        client = MagicMock()
-        track_id = uuid.uuid4()
-        # Create more chunks than batch size
-        chunks = _make_chunks(BATCH_SIZE + 50)
+        The contract is that work crosses batch boundaries, not the
+        production constant itself, so a shrunken BATCH_SIZE covers it
+        without building 150 full chunks.
+        """
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
+        # Create more chunks than the (patched) batch size
+        chunks = _make_chunks(6)
 
-        count = upsert_track_embeddings(client, track_id, chunks)
+        count = await upsert_track_embeddings(client, track_id, chunks)
 
-        assert count == BATCH_SIZE + 50
-        # Should have 2 upsert calls (100 + 50)
-        assert client.upsert.call_count == 2
+        assert count == 6
+        # Should have 2 upsert calls (4 + 2)
+        assert len(client.upsert_calls) == 2
 
-    @patch("app.audio.qdrant_setup.settings")
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_payload_has_correct_fields(
+    async def test_payload_has_correct_fields(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
         """Each upserted point has correct payload fields."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
         chunks = _make_chunks(1)
         metadata = {"artist": "Test Artist", "title": "Test Track", "genre": "Rock"}
 
-        upsert_track_embeddings(client, track_id, chunks, metadata=metadata)
+        await upsert_track_embeddings(client, track_id, chunks, metadata=metadata)
 
         # Extract the points passed to upsert
-        upsert_call = client.upsert.call_args
-        points = upsert_call.kwargs["points"]
+        points = client.upsert_calls[0]["points"]
         assert len(points) == 1
 
-        payload = points[0].payload
-        assert payload["track_id"] == str(track_id)
-        assert payload["offset_sec"] == 0.0
-        assert payload["chunk_index"] == 0
-        assert payload["duration_sec"] == 10.0
-        assert payload["artist"] == "Test Artist"
-        assert payload["title"] == "Test Track"
-        assert payload["genre"] == "Rock"
-
-    @patch("app.audio.qdrant_setup.settings")
+        # One dict comparison: fails with a full diff instead of on the
+        # first mismatched key.
+        assert points[0].payload == {
+            "track_id": str(track_id),
+            "offset_sec": 0.0,
+            "chunk_index": 0,
+            "duration_sec": 10.0,
+            "artist": "Test Artist",
+            "title": "Test Track",
+            "genre": "Rock",
+        }
+
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_returns_count_of_upserted_points(
+    async def test_returns_count_of_upserted_points(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
         """Returns the number of upserted points."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
         chunks = _make_chunks(7)
 
-        count = upsert_track_embeddings(client, track_id, chunks)
+        count = await upsert_track_embeddings(client, track_id, chunks)
 
         assert count == 7
 
-    @patch("app.audio.qdrant_setup.settings")
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_empty_chunks_returns_zero(
+    async def test_empty_chunks_returns_zero(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
         """Empty chunk list returns 0 without calling upsert."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
 
-        count = upsert_track_embeddings(client, track_id, [])
+        count = await upsert_track_embeddings(client, track_id, [])
 
         assert count == 0
-        client.upsert.assert_not_called()
+        assert client.upsert_calls == []
 
-    @patch("app.audio.qdrant_setup.settings")
     @patch("app.audio.qdrant_setup.ensure_collection")
-    def test_no_metadata_omits_fields(
+    async def test_no_metadata_omits_fields(
         self,
         mock_ensure: MagicMock,
-        mock_settings: MagicMock,
     ) -> None:
         """When no metadata provided, payload only has core fields."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
         chunks = _make_chunks(1)
 
-        upsert_track_embeddings(client, track_id, chunks)
+        await upsert_track_embeddings(client, track_id, chunks)
 
-        upsert_call = client.upsert.call_args
-        points = upsert_call.kwargs["points"]
+        points = client.upsert_calls[0]["points"]
         payload = points[0].payload
 
-        assert "track_id" in payload
-        assert "offset_sec" in payload
-        assert "chunk_index" in payload
-        assert "duration_sec" in payload
-        assert "artist" not in payload
-        assert "title" not in payload
-        assert "genre" not in payload
+        assert set(payload) == {"track_id", "offset_sec", "chunk_index", "duration_sec"}
 
 
 # ──────────────────────────────────────────────
@@ -291,23 +292,20 @@ class TestUpsertTrackEmbeddings:
 
 
 class TestDeleteTrackEmbeddings:
-    @patch("app.audio.qdrant_setup.settings")
-    def test_calls_delete_with_correct_filter(self, mock_settings: MagicMock) -> None:
+    async def test_calls_delete_with_correct_filter(self) -> None:
         """Calls client.delete with a filter on track_id."""
-        mock_settings.qdrant_collection_name = "audio_embeddings"
-
-        client = MagicMock()
-        track_id = uuid.uuid4()
+        client = FakeQdrant()
+        track_id = _TEST_TRACK_ID
 
-        delete_track_embeddings(client, track_id)
+        await delete_track_embeddings(client, track_id)
 
-        client.delete.assert_called_once()
-        delete_call = client.delete.call_args
+        assert len(client.delete_calls) == 1
+        delete_call = client.delete_calls[0]
 
-        assert delete_call.kwargs["collection_name"] == "audio_embeddings"
+        assert delete_call["collection_name"] == "audio_embeddings"
 
         # Verify the filter structure
-        selector = delete_call.kwargs["points_selector"]
+        selector = delete_call["points_selector"]
         assert isinstance(selector, models.FilterSelector)
         filter_obj = selector.filter
         assert len(filter_obj.must) == 1
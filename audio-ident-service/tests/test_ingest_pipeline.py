@@ -3,14 +3,19 @@
 All external dependencies (DB, Qdrant, CLAP, Olaf, ffmpeg) are mocked.
 """
 
+import itertools
 import uuid
-from contextlib import asynccontextmanager
+from contextlib import contextmanager
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
-from app.audio.embedding import EmbeddingError
+from app.audio.decode import AudioDecodeError
+from app.audio.embedding import AudioChunk, EmbeddingError
+from app.audio.metadata import AudioMetadata
 from app.ingest.pipeline import (
     AUDIO_EXTENSIONS,
     MAX_INGESTION_DURATION,
@@ -21,6 +26,14 @@ from app.ingest.pipeline import (
     ingest_file,
 )
 
+# Canonical 64-char fake SHA-256 hex digest shared by all tests
+_FAKE_HASH = "abcdef1234567890" * 4
+
+# Pre-generated track IDs: uuid4() hits the CSPRNG on every call, and the
+# tests only need values that are distinct within a test, not random.
+# cycle() keeps the iterator from exhausting as the module grows.
+_next_uuid = itertools.cycle([uuid.uuid4() for _ in range(64)]).__next__
+
 # Mock settings before tests run
 _MOCK_SETTINGS = MagicMock()
 _MOCK_SETTINGS.embedding_model = "clap-htsat-large"
@@ -31,6 +44,20 @@ _MOCK_SETTINGS.embedding_dim = 512
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _fake_copy2():
+    """No-op shutil.copy2 for the whole module.
+
+    No pipeline test cares about the raw-file copy, so one module-wide
+    monkeypatch replaces the per-test patch("shutil.copy2") swaps.
+    Lives here rather than conftest.py because only this module needs it.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setattr("shutil.copy2", lambda *args, **kwargs: None)
+    yield
+    mp.undo()
+
+
 @pytest.fixture
 def mock_session():
     """Create a mock async session that supports context manager usage."""
@@ -41,51 +68,58 @@ def mock_session():
 
 
 @pytest.fixture
-def mock_session_factory(mock_session):
-    """Create a mock session factory returning an async context manager."""
+def session_factory(mock_session):
+    """Session factory: a callable returning an async context manager.
 
-    @asynccontextmanager
-    async def _factory():
-        yield mock_session
+    Mirrors async_sessionmaker's calling convention. One context manager
+    instance is shared across the pipeline's session blocks; it yields
+    the same mock_session each time.
+    """
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=mock_session)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return lambda: ctx
 
-    # We need a callable that returns an async context manager.
-    # async_sessionmaker() returns an AsyncSession context manager.
-    class _MockSessionFactory:
-        def __call__(self):
-            return _factory()
 
-    return _MockSessionFactory()
+# The CLAP and Qdrant mocks are passed through the pipeline but never
+# asserted against, so one instance per session is enough.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_clap_model():
     """Mock CLAP model."""
     return MagicMock(name="mock_clap_model")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_clap_processor():
     """Mock CLAP processor."""
     return MagicMock(name="mock_clap_processor")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_qdrant_client():
     """Mock Qdrant client."""
     client = MagicMock(name="mock_qdrant_client")
-    client.get_collections.return_value = MagicMock(collections=[])
+    # Only .collections is read; a SimpleNamespace is far cheaper than a
+    # fully-specced MagicMock.
+    client.get_collections.return_value = SimpleNamespace(collections=[])
     return client
 
 
-@pytest.fixture
-def temp_audio_dir(tmp_path: Path) -> Path:
-    """Create a temporary directory with fake audio files."""
-    audio_dir = tmp_path / "audio"
-    audio_dir.mkdir()
+@pytest.fixture(scope="session")
+def temp_audio_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory with fake audio files, shared for the session.
 
-    # Create dummy audio files (content doesn't matter for mocked tests)
+    Tests only read the file names (all decoding is mocked) and never
+    mutate the directory, so one copy serves every test.
+    """
+    audio_dir = tmp_path_factory.mktemp("audio")
+
+    # Create empty dummy audio files (content is never read; decoding and
+    # hashing are mocked, and only the names/extensions matter)
     for name in ["song1.mp3", "song2.wav", "song3.flac"]:
-        (audio_dir / name).write_bytes(b"\x00" * 1024)
+        (audio_dir / name).touch()
 
     # Create a non-audio file that should be ignored
     (audio_dir / "readme.txt").write_text("not audio")
@@ -93,303 +127,173 @@ def temp_audio_dir(tmp_path: Path) -> Path:
     return audio_dir
 
 
-@pytest.fixture
-def temp_single_file(tmp_path: Path) -> Path:
-    """Create a single temporary audio file."""
-    audio_file = tmp_path / "test_track.mp3"
-    audio_file.write_bytes(b"\xff\xfb\x90\x00" * 256)
+@pytest.fixture(scope="session")
+def temp_single_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A single audio file, shared for the session (content is never read)."""
+    audio_file = tmp_path_factory.mktemp("single") / "test_track.mp3"
+    audio_file.touch()
     return audio_file
 
 
-# Helper: PCM data for a specific duration at 16kHz f32le (4 bytes/sample)
-def pcm_for_duration(seconds: float, sample_rate: int = 16000) -> bytes:
-    """Generate silent PCM bytes for a given duration."""
-    num_samples = int(seconds * sample_rate)
-    return b"\x00\x00\x00\x00" * num_samples  # 4 bytes per f32le sample
-
-
-# ---------------------------------------------------------------------------
-# Tests for ingest_file
-# ---------------------------------------------------------------------------
-
+# Single zeroed backing buffer shared by all pcm_for_duration calls, grown
+# lazily to the largest request. The pipeline only derives a duration from
+# len(pcm), so materializing a fresh multi-hundred-MB bytes object per test
+# (2000s at 48kHz is 384 MB) is pure waste; a memoryview slice reports the
+# right length without copying.
+_pcm_backing = b""
 
-@pytest.mark.asyncio
-async def test_successful_ingestion(
-    temp_single_file,
-    mock_clap_model,
-    mock_clap_processor,
-    mock_qdrant_client,
-    mock_session,
-):
-    """All pipeline steps succeed -> status='success'."""
-    pcm_16k = pcm_for_duration(10.0, 16000)
-    pcm_48k = pcm_for_duration(10.0, 48000)
-    track_uuid = uuid.uuid4()
 
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
+def pcm_for_duration(seconds: float, sample_rate: int = 16000) -> memoryview:
+    """Zero PCM of the given duration as a view over a shared buffer."""
+    global _pcm_backing
+    needed = int(seconds * sample_rate) * 4  # 4 bytes per f32le sample
+    if len(_pcm_backing) < needed:
+        # bytes(n) zero-fills via one C-level memset; b"\x00" * n goes
+        # through the slower sequence-repeat path.
+        _pcm_backing = bytes(needed)
+    return memoryview(_pcm_backing)[:needed]
 
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
 
-    factory = _Factory()
+def _meta(**overrides) -> AudioMetadata:
+    """AudioMetadata stub with typical tag values; override fields per test.
 
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Test Song",
-                artist="Test Artist",
-                album="Test Album",
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-        patch("app.ingest.pipeline.raw_audio_path", return_value=Path("/tmp/fake.mp3")),
-        patch("app.ingest.pipeline.ensure_storage_dirs"),
-        patch("shutil.copy2"),
-        patch("app.ingest.pipeline.f32le_to_s16le", return_value=b"\x00" * 100),
-        patch(
-            "app.ingest.pipeline.generate_chromaprint",
-            new_callable=AsyncMock,
-            return_value="1234,5678,9012",
-        ),
-        patch(
-            "app.ingest.pipeline.check_content_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.olaf_index_track",
-            new_callable=AsyncMock,
-            return_value=True,
-        ),
-        patch(
-            "app.ingest.pipeline.generate_chunked_embeddings",
+    A plain dataclass instance, not a MagicMock: the pipeline only reads
+    attributes, and dataclass construction is orders of magnitude cheaper.
+    """
+    fields: dict[str, object] = {
+        "title": "Test Song",
+        "artist": "Test Artist",
+        "album": "Test Album",
+        "sample_rate": 44100,
+        "channels": 2,
+        "bitrate": 320000,
+        "format": "mp3",
+        "file_size_bytes": 1024,
+    }
+    fields.update(overrides)
+    return AudioMetadata(**fields)
+
+
+def _build_pipeline_mocks() -> dict[str, object]:
+    """Success-path mocks for every collaborator ingest_file touches."""
+    return {
+        "compute_file_hash": MagicMock(return_value=_FAKE_HASH),
+        "check_file_duplicate": AsyncMock(return_value=None),
+        "extract_metadata": MagicMock(return_value=_meta()),
+        # The 48k stream only feeds generate_chunked_embeddings, which is
+        # mocked here, so an empty buffer stands in for it.
+        "decode_dual_rate": AsyncMock(return_value=(pcm_for_duration(10.0, 16000), b"")),
+        "raw_audio_path": MagicMock(return_value=Path("/tmp/fake.mp3")),
+        "ensure_storage_dirs": MagicMock(),
+        "f32le_to_s16le": MagicMock(return_value=b"\x00" * 100),
+        "generate_chromaprint": AsyncMock(return_value="1234,5678,9012"),
+        "check_content_duplicate": AsyncMock(return_value=None),
+        "olaf_index_track": AsyncMock(return_value=True),
+        "generate_chunked_embeddings": MagicMock(
             return_value=[
-                MagicMock(embedding=[0.1] * 512, offset_sec=0.0, chunk_index=0, duration_sec=10.0)
-            ],
+                AudioChunk(
+                    embedding=np.full(512, 0.1, dtype=np.float32),
+                    offset_sec=0.0,
+                    chunk_index=0,
+                    duration_sec=10.0,
+                )
+            ]
         ),
-        patch("app.ingest.pipeline.upsert_track_embeddings", return_value=1),
-        patch("app.ingest.pipeline.uuid.uuid4", return_value=track_uuid),
-        patch("app.ingest.pipeline.settings", _MOCK_SETTINGS),
-    ):
-        result = await ingest_file(
-            temp_single_file,
-            mock_clap_model,
-            mock_clap_processor,
-            mock_qdrant_client,
-            factory,
-        )
+        "upsert_track_embeddings": AsyncMock(return_value=1),
+        "settings": _MOCK_SETTINGS,
+    }
 
-    assert result.status == "success"
-    assert result.track_id == track_uuid
-    assert result.duration_seconds == pytest.approx(10.0, abs=0.1)
 
+def _assert_result(result: IngestResult, **fields) -> None:
+    """Assert a set of IngestResult attributes in one declarative call."""
+    for name, expected in fields.items():
+        assert getattr(result, name) == expected, name
 
-@pytest.mark.asyncio
-async def test_file_hash_duplicate_detected(
-    temp_single_file,
-    mock_clap_model,
-    mock_clap_processor,
-    mock_qdrant_client,
-    mock_session,
-):
-    """Step 2: file hash already in DB -> status='duplicate' with metadata."""
-    existing_uuid = uuid.uuid4()
 
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
+# Built once at import: mock construction (especially AsyncMock) is the
+# dominant setup cost per test. Call history is reset on each use; the
+# configured return values/side effects are preserved.
+_CANON_PIPELINE_MOCKS = _build_pipeline_mocks()
 
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
 
-    factory = _Factory()
+@contextmanager
+def patched_pipeline(track_uuid: uuid.UUID | None = None, **overrides):
+    """Patch the full set of ingest_file collaborators in one shot.
 
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=existing_uuid,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Duplicate Song",
-                artist="Duplicate Artist",
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-    ):
-        result = await ingest_file(
-            temp_single_file,
-            mock_clap_model,
-            mock_clap_processor,
-            mock_qdrant_client,
-            factory,
-        )
+    Installs success-path defaults; keyword overrides replace individual
+    entries (keys are attribute names on app.ingest.pipeline). Yields the
+    mock dict so tests can assert against specific collaborators.
 
-    assert result.status == "duplicate"
-    assert result.track_id == existing_uuid
-    # SIG-1 fix: title/artist should be populated from metadata, not None
-    assert result.title == "Duplicate Song"
-    assert result.artist == "Duplicate Artist"
+    Uses pytest.MonkeyPatch rather than unittest.mock.patch: one setattr
+    plus one undo entry per attribute, skipping the _patch state machine.
+    """
+    for mock in _CANON_PIPELINE_MOCKS.values():
+        mock.reset_mock()
+    mocks = dict(_CANON_PIPELINE_MOCKS)
+    mocks.update(overrides)
+    mp = pytest.MonkeyPatch()
+    try:
+        if track_uuid is not None:
+            mp.setattr("app.ingest.pipeline.uuid.uuid4", lambda: track_uuid)
+        for name, replacement in mocks.items():
+            mp.setattr(f"app.ingest.pipeline.{name}", replacement)
+        yield mocks
+    finally:
+        mp.undo()
 
 
-@pytest.mark.asyncio
-async def test_content_duplicate_detected(
+# ---------------------------------------------------------------------------
+# Tests for ingest_file
+# ---------------------------------------------------------------------------
+
+
+async def test_successful_ingestion(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
-    """Chromaprint finds a content match -> status='duplicate'.
-
-    The dedup check now runs BEFORE Olaf/CLAP indexing, so no cleanup is needed.
-    """
-    content_dup_uuid = uuid.uuid4()
-    pcm_16k = pcm_for_duration(10.0, 16000)
-    pcm_48k = pcm_for_duration(10.0, 48000)
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
+    """All pipeline steps succeed -> status='success'."""
+    track_uuid = _next_uuid()
 
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Song",
-                artist="Artist",
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-        patch("app.ingest.pipeline.raw_audio_path", return_value=Path("/tmp/fake.mp3")),
-        patch("app.ingest.pipeline.ensure_storage_dirs"),
-        patch("shutil.copy2"),
-        patch("app.ingest.pipeline.f32le_to_s16le", return_value=b"\x00" * 100),
-        patch(
-            "app.ingest.pipeline.generate_chromaprint",
-            new_callable=AsyncMock,
-            return_value="1234,5678",
-        ),
-        patch(
-            "app.ingest.pipeline.check_content_duplicate",
-            new_callable=AsyncMock,
-            return_value=content_dup_uuid,
-        ),
-        patch(
-            "app.ingest.pipeline.olaf_index_track",
-            new_callable=AsyncMock,
-            return_value=True,
-        ) as mock_olaf,
-    ):
+    with patched_pipeline(track_uuid=track_uuid):
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
-    assert result.status == "duplicate"
-    assert result.track_id == content_dup_uuid
-    # Olaf should NOT be called since dedup runs before indexing
-    mock_olaf.assert_not_called()
+    _assert_result(
+        result,
+        status="success",
+        track_id=track_uuid,
+        duration_seconds=pytest.approx(10.0, abs=0.1),
+    )
 
 
-@pytest.mark.asyncio
-async def test_decode_error_returns_error_status(
+async def test_file_hash_duplicate_detected(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
-    """FFmpeg decode failure -> status='error'. Raw file should not be saved."""
-    from app.audio.decode import AudioDecodeError
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
+    """Step 2: file hash already in DB -> status='duplicate' with metadata."""
+    existing_uuid = _next_uuid()
 
     with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
+        patch("app.ingest.pipeline.compute_file_hash", return_value=_FAKE_HASH),
         patch(
             "app.ingest.pipeline.check_file_duplicate",
             new_callable=AsyncMock,
-            return_value=None,
+            return_value=existing_uuid,
         ),
         patch(
             "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Song",
-                artist=None,
-                album=None,
-                sample_rate=None,
-                channels=None,
-                bitrate=None,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            side_effect=AudioDecodeError("ffmpeg crashed"),
+            return_value=_meta(title="Duplicate Song", artist="Duplicate Artist", album=None),
         ),
     ):
         result = await ingest_file(
@@ -397,330 +301,158 @@ async def test_decode_error_returns_error_status(
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
-    assert result.status == "error"
-    assert result.error is not None
-    assert "Decode error" in result.error
+    # SIG-1 fix: title/artist should be populated from metadata, not None
+    _assert_result(
+        result,
+        status="duplicate",
+        track_id=existing_uuid,
+        title="Duplicate Song",
+        artist="Duplicate Artist",
+    )
 
 
-@pytest.mark.asyncio
-async def test_too_short_file_skipped(
+async def test_content_duplicate_detected(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
-    """Audio shorter than MIN_INGESTION_DURATION -> status='skipped'.
+    """Chromaprint finds a content match -> status='duplicate'.
 
-    Raw file should NOT be saved since duration validation fails first.
+    The dedup check now runs BEFORE Olaf/CLAP indexing, so no cleanup is needed.
     """
-    pcm_16k = pcm_for_duration(1.0, 16000)  # 1 second < 3 second min
-    pcm_48k = pcm_for_duration(1.0, 48000)
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
+    content_dup_uuid = _next_uuid()
 
-    factory = _Factory()
-
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Short",
-                artist=None,
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=128000,
-                format="mp3",
-                file_size_bytes=512,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-    ):
+    with patched_pipeline(
+        check_content_duplicate=AsyncMock(return_value=content_dup_uuid),
+    ) as mocks:
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
-    assert result.status == "skipped"
-    assert result.error is not None
-    assert "Too short" in result.error
-    assert result.duration_seconds == pytest.approx(1.0, abs=0.1)
-
-
-@pytest.mark.asyncio
-async def test_too_long_file_skipped(
+    _assert_result(result, status="duplicate", track_id=content_dup_uuid)
+    # Olaf should NOT be called since dedup runs before indexing
+    mocks["olaf_index_track"].assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("duration_sec", "expected_status", "expected_substr"),
+    [
+        # 1 second < 3 second min
+        (1.0, "skipped", "Too short"),
+        # 2000s > 1800s max
+        (2000.0, "skipped", "Too long"),
+        # None -> decode_dual_rate raises AudioDecodeError
+        (None, "error", "Decode error"),
+    ],
+)
+async def test_rejected_file_statuses(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
+    duration_sec,
+    expected_status,
+    expected_substr,
 ):
-    """Audio longer than MAX_INGESTION_DURATION -> status='skipped'.
+    """Duration limits and decode failures short-circuit before storage.
 
-    Raw file should NOT be saved since duration validation fails first.
+    In all three cases the raw file must NOT be saved: validation fails
+    before step 4.
     """
-    pcm_16k = pcm_for_duration(2000.0, 16000)  # 2000s > 1800s max
-    pcm_48k = pcm_for_duration(2000.0, 48000)
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
-
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Long",
-                artist=None,
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=128000,
-                format="mp3",
-                file_size_bytes=1024000,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-    ):
+    if duration_sec is None:
+        decode = AsyncMock(side_effect=AudioDecodeError("ffmpeg crashed"))
+    else:
+        # Duration is derived from the 16k stream; validation fails before
+        # the 48k stream is ever touched, so it can stay empty.
+        decode = AsyncMock(return_value=(pcm_for_duration(duration_sec, 16000), b""))
+
+    with patched_pipeline(decode_dual_rate=decode):
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
-    assert result.status == "skipped"
+    assert result.status == expected_status
     assert result.error is not None
-    assert "Too long" in result.error
+    assert expected_substr in result.error
+    if duration_sec is not None:
+        assert result.duration_seconds == pytest.approx(duration_sec, abs=0.1)
 
 
-@pytest.mark.asyncio
 async def test_olaf_failure_continues(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
     """Olaf indexing fails -> ingestion still succeeds (partial failure)."""
-    pcm_16k = pcm_for_duration(10.0, 16000)
-    pcm_48k = pcm_for_duration(10.0, 48000)
-    track_uuid = uuid.uuid4()
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
+    track_uuid = _next_uuid()
 
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Song",
-                artist="Artist",
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-        patch("app.ingest.pipeline.raw_audio_path", return_value=Path("/tmp/fake.mp3")),
-        patch("app.ingest.pipeline.ensure_storage_dirs"),
-        patch("shutil.copy2"),
-        patch("app.ingest.pipeline.f32le_to_s16le", return_value=b"\x00" * 100),
-        patch(
-            "app.ingest.pipeline.generate_chromaprint",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.olaf_index_track",
-            new_callable=AsyncMock,
-            side_effect=Exception("Olaf LMDB error"),
-        ),
-        patch(
-            "app.ingest.pipeline.generate_chunked_embeddings",
-            return_value=[
-                MagicMock(embedding=[0.1] * 512, offset_sec=0.0, chunk_index=0, duration_sec=10.0)
-            ],
-        ),
-        patch("app.ingest.pipeline.upsert_track_embeddings", return_value=1),
-        patch("app.ingest.pipeline.uuid.uuid4", return_value=track_uuid),
-        patch("app.ingest.pipeline.settings", _MOCK_SETTINGS),
+    with patched_pipeline(
+        track_uuid=track_uuid,
+        generate_chromaprint=AsyncMock(return_value=None),
+        olaf_index_track=AsyncMock(side_effect=Exception("Olaf LMDB error")),
     ):
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     # Olaf failure is not fatal; track still ingested
-    assert result.status == "success"
-    assert result.track_id == track_uuid
+    _assert_result(result, status="success", track_id=track_uuid)
 
 
-@pytest.mark.asyncio
 async def test_embedding_failure_continues(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
     """CLAP embedding failure -> ingestion still succeeds (partial)."""
-    pcm_16k = pcm_for_duration(10.0, 16000)
-    pcm_48k = pcm_for_duration(10.0, 48000)
-    track_uuid = uuid.uuid4()
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
+    track_uuid = _next_uuid()
 
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title="Song",
-                artist="Artist",
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-        patch("app.ingest.pipeline.raw_audio_path", return_value=Path("/tmp/fake.mp3")),
-        patch("app.ingest.pipeline.ensure_storage_dirs"),
-        patch("shutil.copy2"),
-        patch("app.ingest.pipeline.f32le_to_s16le", return_value=b"\x00" * 100),
-        patch(
-            "app.ingest.pipeline.generate_chromaprint",
-            new_callable=AsyncMock,
-            return_value="1234,5678",
-        ),
-        patch(
-            "app.ingest.pipeline.check_content_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.olaf_index_track",
-            new_callable=AsyncMock,
-            return_value=True,
-        ),
-        patch(
-            "app.ingest.pipeline.generate_chunked_embeddings",
-            side_effect=EmbeddingError("CLAP crashed"),
-        ),
-        patch("app.ingest.pipeline.uuid.uuid4", return_value=track_uuid),
-        patch("app.ingest.pipeline.settings", _MOCK_SETTINGS),
+    with patched_pipeline(
+        track_uuid=track_uuid,
+        generate_chunked_embeddings=MagicMock(side_effect=EmbeddingError("CLAP crashed")),
     ):
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     # Embedding failure is not fatal; track still ingested with 0 embeddings
-    assert result.status == "success"
-    assert result.track_id == track_uuid
+    _assert_result(result, status="success", track_id=track_uuid)
 
 
-@pytest.mark.asyncio
 async def test_unexpected_error_returns_error_status(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
+    session_factory,
 ):
     """Unexpected exception -> status='error' with message."""
-
-    class _Factory:
-        def __call__(self):
-            raise RuntimeError("DB connection refused")
-
-    factory = _Factory()
-
     with patch(
         "app.ingest.pipeline.compute_file_hash",
         side_effect=RuntimeError("disk error"),
@@ -730,7 +462,7 @@ async def test_unexpected_error_returns_error_status(
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     assert result.status == "error"
@@ -738,77 +470,30 @@ async def test_unexpected_error_returns_error_status(
     assert "Unexpected error" in result.error
 
 
-@pytest.mark.asyncio
 async def test_no_metadata_title_uses_filename(
     temp_single_file,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
     mock_session,
+    session_factory,
 ):
     """When metadata has no title, use the filename stem instead."""
-    pcm_16k = pcm_for_duration(10.0, 16000)
-    pcm_48k = pcm_for_duration(10.0, 48000)
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
-
-    with (
-        patch("app.ingest.pipeline.compute_file_hash", return_value="abcdef1234567890" * 4),
-        patch(
-            "app.ingest.pipeline.check_file_duplicate",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.extract_metadata",
-            return_value=MagicMock(
-                title=None,  # No title in metadata
-                artist=None,
-                album=None,
-                sample_rate=44100,
-                channels=2,
-                bitrate=320000,
-                format="mp3",
-                file_size_bytes=1024,
-            ),
-        ),
-        patch(
-            "app.ingest.pipeline.decode_dual_rate",
-            new_callable=AsyncMock,
-            return_value=(pcm_16k, pcm_48k),
-        ),
-        patch("app.ingest.pipeline.raw_audio_path", return_value=Path("/tmp/fake.mp3")),
-        patch("app.ingest.pipeline.ensure_storage_dirs"),
-        patch("shutil.copy2"),
-        patch("app.ingest.pipeline.f32le_to_s16le", return_value=b"\x00" * 100),
-        patch(
-            "app.ingest.pipeline.generate_chromaprint",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-        patch(
-            "app.ingest.pipeline.olaf_index_track",
-            new_callable=AsyncMock,
-            return_value=True,
-        ),
-        patch("app.ingest.pipeline.generate_chunked_embeddings", return_value=[]),
-        patch("app.ingest.pipeline.upsert_track_embeddings", return_value=0),
-        patch("app.ingest.pipeline.settings", _MOCK_SETTINGS),
+    with patched_pipeline(
+        extract_metadata=MagicMock(
+            # No title in metadata -> pipeline falls back to the filename stem
+            return_value=_meta(title=None, artist=None, album=None)
+        ),
+        generate_chromaprint=AsyncMock(return_value=None),
+        generate_chunked_embeddings=MagicMock(return_value=[]),
+        upsert_track_embeddings=AsyncMock(return_value=0),
     ):
         result = await ingest_file(
             temp_single_file,
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     assert result.status == "success"
@@ -825,25 +510,14 @@ async def test_no_metadata_title_uses_filename(
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_scans_correct_extensions(
     temp_audio_dir,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
     """Only files with audio extensions are picked up."""
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
-
     with (
         patch(
             "app.ingest.pipeline.ingest_file",
@@ -857,7 +531,7 @@ async def test_scans_correct_extensions(
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     # song1.mp3, song2.wav, song3.flac = 3 audio files
@@ -866,13 +540,11 @@ async def test_scans_correct_extensions(
     assert mock_ingest.call_count == 3
 
 
-@pytest.mark.asyncio
 async def test_empty_directory(
     tmp_path,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
 ):
     """Empty directory -> report with total_files=0."""
     empty_dir = tmp_path / "empty"
@@ -899,41 +571,24 @@ async def test_empty_directory(
     assert report.errors == 0
 
 
-@pytest.mark.asyncio
 async def test_report_counts_correct(
     temp_audio_dir,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
     """Report correctly tallies success/duplicate/error counts."""
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
-
     # Return different statuses for each file
     results = [
-        IngestResult(file_path="song1.mp3", status="success", track_id=uuid.uuid4()),
-        IngestResult(file_path="song2.wav", status="duplicate", track_id=uuid.uuid4()),
+        IngestResult(file_path="song1.mp3", status="success", track_id=_next_uuid()),
+        IngestResult(file_path="song2.wav", status="duplicate", track_id=_next_uuid()),
         IngestResult(file_path="song3.flac", status="error", error="boom"),
     ]
-    call_count = 0
-
-    async def mock_ingest(*args, **kwargs):
-        nonlocal call_count
-        r = results[call_count]
-        call_count += 1
-        return r
 
     with (
-        patch("app.ingest.pipeline.ingest_file", side_effect=mock_ingest),
+        # AsyncMock dispenses a side_effect list one item per await
+        patch("app.ingest.pipeline.ingest_file", new=AsyncMock(side_effect=results)),
         patch("app.ingest.pipeline.ensure_collection"),
     ):
         report = await ingest_directory(
@@ -941,7 +596,7 @@ async def test_report_counts_correct(
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     assert report.total_files == 3
@@ -951,40 +606,22 @@ async def test_report_counts_correct(
     assert len(report.results) == 3
 
 
-@pytest.mark.asyncio
 async def test_error_does_not_halt_batch(
     temp_audio_dir,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
     """An error on one file doesn't stop processing the rest."""
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
-
     results = [
         IngestResult(file_path="song1.mp3", status="error", error="boom"),
-        IngestResult(file_path="song2.wav", status="success", track_id=uuid.uuid4()),
-        IngestResult(file_path="song3.flac", status="success", track_id=uuid.uuid4()),
+        IngestResult(file_path="song2.wav", status="success", track_id=_next_uuid()),
+        IngestResult(file_path="song3.flac", status="success", track_id=_next_uuid()),
     ]
-    call_count = 0
-
-    async def mock_ingest(*args, **kwargs):
-        nonlocal call_count
-        r = results[call_count]
-        call_count += 1
-        return r
 
     with (
-        patch("app.ingest.pipeline.ingest_file", side_effect=mock_ingest),
+        patch("app.ingest.pipeline.ingest_file", new=AsyncMock(side_effect=results)),
         patch("app.ingest.pipeline.ensure_collection"),
     ):
         report = await ingest_directory(
@@ -992,7 +629,7 @@ async def test_error_does_not_halt_batch(
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     # All 3 files were processed despite the first erroring
@@ -1002,32 +639,26 @@ async def test_error_does_not_halt_batch(
     assert len(report.results) == 3
 
 
-@pytest.mark.asyncio
 async def test_recursive_directory_scan(
-    tmp_path,
+    monkeypatch,
     mock_clap_model,
     mock_clap_processor,
     mock_qdrant_client,
-    mock_session,
+    session_factory,
 ):
-    """Files in subdirectories are also discovered."""
-    root = tmp_path / "music"
-    root.mkdir()
-    sub = root / "subdir"
-    sub.mkdir()
+    """Files in subdirectories are also discovered.
 
-    (root / "top.mp3").write_bytes(b"\x00" * 100)
-    (sub / "nested.flac").write_bytes(b"\x00" * 100)
-
-    mock_session_ctx = AsyncMock()
-    mock_session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session_ctx.__aexit__ = AsyncMock(return_value=False)
-
-    class _Factory:
-        def __call__(self):
-            return mock_session_ctx
-
-    factory = _Factory()
+    The scan only calls Path.rglob and Path.is_file, so both are faked
+    instead of touching a real directory tree on disk. ingest_file is
+    mocked, so the fake paths are never opened.
+    """
+    fake_tree = [
+        Path("/fake/music/top.mp3"),
+        Path("/fake/music/sub/nested.flac"),
+        Path("/fake/music/sub/notes.txt"),  # filtered out by extension
+    ]
+    monkeypatch.setattr(Path, "rglob", lambda self, pattern: iter(fake_tree))
+    monkeypatch.setattr(Path, "is_file", lambda self: True)
 
     with (
         patch(
@@ -1038,11 +669,11 @@ async def test_recursive_directory_scan(
         patch("app.ingest.pipeline.ensure_collection"),
     ):
         report = await ingest_directory(
-            root,
+            Path("/fake/music"),
             mock_clap_model,
             mock_clap_processor,
             mock_qdrant_client,
-            factory,
+            session_factory,
         )
 
     assert report.total_files == 2
@@ -1071,10 +702,9 @@ def test_duration_limits():
 def test_ingest_result_defaults():
     """IngestResult has correct default values."""
     result = IngestResult(file_path="/some/file.mp3")
-    assert result.status == "pending"
-    assert result.track_id is None
-    assert result.error is None
-    assert result.duration_seconds is None
+    _assert_result(
+        result, status="pending", track_id=None, error=None, duration_seconds=None
+    )
 
 
 def test_ingest_report_defaults():
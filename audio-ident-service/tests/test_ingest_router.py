@@ -10,7 +10,11 @@ Uses a standalone FastAPI app with only the ingest router mounted.
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import json
+import struct
 import uuid
+from contextlib import ExitStack
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -19,6 +23,7 @@ from fastapi.responses import JSONResponse
 from httpx import ASGITransport, AsyncClient
 
 from app.auth.admin import AdminAuthError
+from app.ingest.pipeline import IngestResult
 from app.routers import ingest as ingest_module
 from app.routers.ingest import router as ingest_router
 from app.schemas.ingest import IngestStatus
@@ -35,62 +40,137 @@ _WAV_DURATION_SAMPLES = _WAV_SAMPLE_RATE  # 1 second
 _WAV_DATA_SIZE = _WAV_DURATION_SAMPLES * _WAV_CHANNELS * (_WAV_BITS_PER_SAMPLE // 8)
 
 
+_WAV_BYTE_RATE = _WAV_SAMPLE_RATE * _WAV_CHANNELS * (_WAV_BITS_PER_SAMPLE // 8)
+_WAV_BLOCK_ALIGN = _WAV_CHANNELS * (_WAV_BITS_PER_SAMPLE // 8)
+
+# The fmt chunk does not depend on the data size, so it is packed once.
+_WAV_FMT_CHUNK = struct.pack(
+    "<4sIHHIIHH",
+    b"fmt ",
+    16,  # fmt chunk size
+    1,  # PCM format
+    _WAV_CHANNELS,
+    _WAV_SAMPLE_RATE,
+    _WAV_BYTE_RATE,
+    _WAV_BLOCK_ALIGN,
+    _WAV_BITS_PER_SAMPLE,
+)
+
+
 def _make_wav_bytes(data_size: int = _WAV_DATA_SIZE) -> bytes:
     """Generate a minimal valid WAV file with silent audio data."""
-    import struct
-
-    file_size = 36 + data_size
-    byte_rate = _WAV_SAMPLE_RATE * _WAV_CHANNELS * (_WAV_BITS_PER_SAMPLE // 8)
-    block_align = _WAV_CHANNELS * (_WAV_BITS_PER_SAMPLE // 8)
-
-    header = struct.pack(
-        "<4sI4s"  # RIFF header
-        "4sIHHIIHH"  # fmt chunk
-        "4sI",  # data chunk header
-        b"RIFF",
-        file_size,
-        b"WAVE",
-        b"fmt ",
-        16,  # fmt chunk size
-        1,  # PCM format
-        _WAV_CHANNELS,
-        _WAV_SAMPLE_RATE,
-        byte_rate,
-        block_align,
-        _WAV_BITS_PER_SAMPLE,
-        b"data",
-        data_size,
+    return (
+        struct.pack("<4sI4s", b"RIFF", 36 + data_size, b"WAVE")
+        + _WAV_FMT_CHUNK
+        + struct.pack("<4sI", b"data", data_size)
+        + bytes(data_size)
+    )
+
+
+# Built once at import: the WAV payload is deterministic and bytes are
+# immutable, so every test can share the same buffer.
+_WAV_BYTES = _make_wav_bytes()
+
+
+def _multipart_body(filename: str, content: bytes, mime: str) -> bytes:
+    """Encode a single 'audio' form field as a multipart/form-data body."""
+    return (
+        (
+            f"--{_MULTIPART_BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="audio"; filename="{filename}"\r\n'
+            f"Content-Type: {mime}\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{_MULTIPART_BOUNDARY}--\r\n".encode()
     )
-    return header + (b"\x00" * data_size)
 
 
-# A track UUID used consistently across success/duplicate tests
-_TRACK_UUID = uuid.uuid4()
+# Canonical WAV upload, encoded once with a fixed boundary. Posting it via
+# content= skips httpx's per-call multipart encoder, which draws a random
+# boundary and re-reads the payload on every request.
+_MULTIPART_BOUNDARY = "testboundary"
+_MULTIPART_HEADERS = {"content-type": f"multipart/form-data; boundary={_MULTIPART_BOUNDARY}"}
+_WAV_UPLOAD_BODY = _multipart_body("test.wav", _WAV_BYTES, "audio/wav")
+
+
+async def _call_app(
+    app: FastAPI, method: str, path: str, headers: dict[str, str], body: bytes = b""
+) -> tuple[int, object]:
+    """Drive the ASGI app directly and return (status, parsed JSON body).
+
+    Skips httpx and ASGITransport for the cheap auth/validation tests:
+    the whole request body is delivered in one message and the response
+    is collected in memory. Not suitable for streaming tests.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("testclient", 50000),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive() -> dict:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    status = 0
+    chunks: list[bytes] = []
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, json.loads(b"".join(chunks))
+
+
+# A track UUID used consistently across success/duplicate tests. Fixed
+# rather than uuid4(): no test needs a distinct ID, so there is no reason
+# to pull kernel entropy at import, and the string form is precomputed
+# for the response assertions.
+_TRACK_UUID = uuid.UUID("00000000-0000-4000-8000-000000000001")
+_TRACK_UUID_STR = str(_TRACK_UUID)
 
 # Admin key used for testing
 _TEST_ADMIN_KEY = "test-admin-key-12345"
 
 
-def _make_success_result() -> MagicMock:
-    """Create an IngestResult mock representing a successful ingestion."""
-    result = MagicMock()
-    result.status = "success"
-    result.track_id = _TRACK_UUID
-    result.title = "Test Song"
-    result.artist = "Test Artist"
-    result.error = None
-    return result
+# Template pipeline results, built once at import. Real IngestResult
+# instances instead of MagicMocks: construction is a plain dataclass
+# __init__, and the router only reads fields, so the templates can be
+# shared across tests without copying.
+_SUCCESS_RESULT = IngestResult(
+    file_path="/tmp/test.wav",
+    track_id=_TRACK_UUID,
+    status="success",
+    title="Test Song",
+    artist="Test Artist",
+)
 
+_DUPLICATE_RESULT = dataclasses.replace(_SUCCESS_RESULT, status="duplicate")
 
-def _make_duplicate_result() -> MagicMock:
-    """Create an IngestResult mock representing a duplicate detection."""
-    result = MagicMock()
-    result.status = "duplicate"
-    result.track_id = _TRACK_UUID
-    result.title = "Test Song"
-    result.artist = "Test Artist"
-    result.error = None
-    return result
+_SHORT_RESULT = IngestResult(
+    file_path="/tmp/short.wav",
+    status="skipped",
+    error="Too short: 1.5s (min: 3.0s)",
+)
+
+_LONG_RESULT = IngestResult(
+    file_path="/tmp/long.wav",
+    status="skipped",
+    error="Too long: 2000.0s (max: 1800.0s)",
+)
 
 
 # ---------------------------------------------------------------------------
@@ -110,15 +190,16 @@ def _reset_ingest_lock():
     ingest_module._ingest_lock = original_lock
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ingest_app() -> FastAPI:
-    """Minimal FastAPI app with only the ingest router mounted."""
+    """Minimal FastAPI app with only the ingest router mounted.
+
+    Session-scoped: the route table and exception handlers are immutable,
+    and the mutable app.state mocks are refreshed per test by
+    _fresh_app_state, so one app instance serves the whole run.
+    """
     application = FastAPI()
     application.include_router(ingest_router, prefix="/api/v1")
-    # Set up app.state attributes accessed by the ingest endpoint
-    application.state.clap_model = MagicMock(name="mock_clap_model")
-    application.state.clap_processor = MagicMock(name="mock_clap_processor")
-    application.state.qdrant = MagicMock(name="mock_qdrant_client")
 
     # Register the AdminAuthError handler (mirrors main.py)
     @application.exception_handler(AdminAuthError)
@@ -131,18 +212,39 @@ def ingest_app() -> FastAPI:
     return application
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _fresh_app_state(ingest_app: FastAPI) -> None:
+    """Reassign fresh app.state mocks so shared-app tests stay isolated."""
+    ingest_app.state.clap_model = MagicMock(name="mock_clap_model")
+    ingest_app.state.clap_processor = MagicMock(name="mock_clap_processor")
+    ingest_app.state.qdrant = MagicMock(name="mock_qdrant_client")
+
+
+@pytest.fixture(scope="session")
 async def client(ingest_app: FastAPI) -> AsyncClient:
-    """Async HTTP client for the ingest app."""
+    """Async HTTP client for the ingest app, shared for the session."""
     transport = ASGITransport(app=ingest_app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
 
+@pytest.fixture(autouse=True)
+def _admin_settings():
+    """Authorize _TEST_ADMIN_KEY for every test.
+
+    Replaces the per-test @patch stacks; tests that need a different key
+    override via monkeypatch.setattr on the patched settings mock.
+    """
+    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
+        yield
+
+
 @pytest.fixture
-def wav_bytes() -> bytes:
-    """A valid WAV file as bytes."""
-    return _make_wav_bytes()
+def mock_magic() -> MagicMock:
+    """Patch python-magic to report audio/wav; tests may override."""
+    with patch("app.routers.ingest.magic") as mocked:
+        mocked.from_buffer.return_value = "audio/wav"
+        yield mocked
 
 
 # ---------------------------------------------------------------------------
@@ -151,29 +253,23 @@ def wav_bytes() -> bytes:
 
 
 @pytest.mark.asyncio
-async def test_ingest_success(client: AsyncClient, wav_bytes: bytes):
+async def test_ingest_success(client: AsyncClient, mock_magic: MagicMock):
     """Valid upload with correct admin key -> 201 with ingested status."""
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-        patch(
-            "app.routers.ingest.ingest_file",
-            new_callable=AsyncMock,
-            return_value=_make_success_result(),
-        ),
+    with patch(
+        "app.routers.ingest.ingest_file",
+        new_callable=AsyncMock,
+        return_value=_SUCCESS_RESULT,
     ):
-        mock_magic.from_buffer.return_value = "audio/wav"
-
         resp = await client.post(
             "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("test.wav", wav_bytes, "audio/wav")},
+            headers={"X-Admin-Key": _TEST_ADMIN_KEY, **_MULTIPART_HEADERS},
+            content=_WAV_UPLOAD_BODY,
         )
 
     assert resp.status_code == 201
     body = resp.json()
     assert body["status"] == IngestStatus.INGESTED
-    assert body["track_id"] == str(_TRACK_UUID)
+    assert body["track_id"] == _TRACK_UUID_STR
     assert body["title"] == "Test Song"
     assert body["artist"] == "Test Artist"
 
@@ -184,29 +280,23 @@ async def test_ingest_success(client: AsyncClient, wav_bytes: bytes):
 
 
 @pytest.mark.asyncio
-async def test_ingest_duplicate(client: AsyncClient, wav_bytes: bytes):
+async def test_ingest_duplicate(client: AsyncClient, mock_magic: MagicMock):
     """SHA-256 match in pipeline -> 201 with duplicate status."""
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-        patch(
-            "app.routers.ingest.ingest_file",
-            new_callable=AsyncMock,
-            return_value=_make_duplicate_result(),
-        ),
+    with patch(
+        "app.routers.ingest.ingest_file",
+        new_callable=AsyncMock,
+        return_value=_DUPLICATE_RESULT,
     ):
-        mock_magic.from_buffer.return_value = "audio/wav"
-
         resp = await client.post(
             "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("test.wav", wav_bytes, "audio/wav")},
+            headers={"X-Admin-Key": _TEST_ADMIN_KEY, **_MULTIPART_HEADERS},
+            content=_WAV_UPLOAD_BODY,
         )
 
     assert resp.status_code == 201
     body = resp.json()
     assert body["status"] == IngestStatus.DUPLICATE
-    assert body["track_id"] == str(_TRACK_UUID)
+    assert body["track_id"] == _TRACK_UUID_STR
 
 
 # ---------------------------------------------------------------------------
@@ -215,16 +305,17 @@ async def test_ingest_duplicate(client: AsyncClient, wav_bytes: bytes):
 
 
 @pytest.mark.asyncio
-async def test_ingest_missing_admin_key(client: AsyncClient, wav_bytes: bytes):
+async def test_ingest_missing_admin_key(ingest_app: FastAPI):
     """No X-Admin-Key header -> 403 Forbidden."""
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
-        resp = await client.post(
-            "/api/v1/ingest",
-            files={"audio": ("test.wav", wav_bytes, "audio/wav")},
-        )
+    status, body = await _call_app(
+        ingest_app,
+        "POST",
+        "/api/v1/ingest",
+        headers=_MULTIPART_HEADERS,
+        body=_WAV_UPLOAD_BODY,
+    )
 
-    assert resp.status_code == 403
-    body = resp.json()
+    assert status == 403
     assert body["error"]["code"] == "FORBIDDEN"
 
 
@@ -234,17 +325,17 @@ async def test_ingest_missing_admin_key(client: AsyncClient, wav_bytes: bytes):
 
 
 @pytest.mark.asyncio
-async def test_ingest_wrong_admin_key(client: AsyncClient, wav_bytes: bytes):
+async def test_ingest_wrong_admin_key(ingest_app: FastAPI):
     """Incorrect X-Admin-Key value -> 403 Forbidden."""
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": "wrong-key"},
-            files={"audio": ("test.wav", wav_bytes, "audio/wav")},
-        )
+    status, body = await _call_app(
+        ingest_app,
+        "POST",
+        "/api/v1/ingest",
+        headers={"X-Admin-Key": "wrong-key", **_MULTIPART_HEADERS},
+        body=_WAV_UPLOAD_BODY,
+    )
 
-    assert resp.status_code == 403
-    body = resp.json()
+    assert status == 403
     assert body["error"]["code"] == "FORBIDDEN"
 
 
@@ -254,156 +345,115 @@ async def test_ingest_wrong_admin_key(client: AsyncClient, wav_bytes: bytes):
 
 
 @pytest.mark.asyncio
-async def test_ingest_no_admin_key_configured(client: AsyncClient, wav_bytes: bytes):
+async def test_ingest_no_admin_key_configured(
+    ingest_app: FastAPI, monkeypatch: pytest.MonkeyPatch
+):
     """Empty ADMIN_API_KEY in settings -> 403 for ALL requests (fail-closed)."""
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key="")):
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": "any-key"},
-            files={"audio": ("test.wav", wav_bytes, "audio/wav")},
-        )
+    monkeypatch.setattr("app.auth.admin.settings.admin_api_key", "")
+
+    status, body = await _call_app(
+        ingest_app,
+        "POST",
+        "/api/v1/ingest",
+        headers={"X-Admin-Key": "any-key", **_MULTIPART_HEADERS},
+        body=_WAV_UPLOAD_BODY,
+    )
 
-    assert resp.status_code == 403
-    body = resp.json()
+    assert status == 403
     assert body["error"]["code"] == "AUTH_NOT_CONFIGURED"
 
 
 # ---------------------------------------------------------------------------
-# Test 6: Unsupported format -> 400 UNSUPPORTED_FORMAT
+# Tests 6-10: Invalid uploads -> 400 with matching error code
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_ingest_unsupported_format(client: AsyncClient):
-    """Non-audio file (e.g. text/plain) -> 400 UNSUPPORTED_FORMAT."""
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-    ):
-        mock_magic.from_buffer.return_value = "text/plain"
-
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("readme.txt", b"Hello world", "text/plain")},
-        )
-
-    assert resp.status_code == 400
-    body = resp.json()
-    assert body["error"]["code"] == "UNSUPPORTED_FORMAT"
-
-
-# ---------------------------------------------------------------------------
-# Test 7: Empty file -> 400 EMPTY_FILE
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_ingest_empty_file(client: AsyncClient):
-    """Zero-byte upload -> 400 EMPTY_FILE."""
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("empty.wav", b"", "audio/wav")},
-        )
-
-    assert resp.status_code == 400
-    body = resp.json()
-    assert body["error"]["code"] == "EMPTY_FILE"
-
-
-# ---------------------------------------------------------------------------
-# Test 8: File too large -> 400 FILE_TOO_LARGE
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_ingest_file_too_large(client: AsyncClient):
-    """File exceeding 50 MB limit -> 400 FILE_TOO_LARGE."""
-    # Create content just over the 50 MB limit
-    oversized = b"\x00" * (50 * 1024 * 1024 + 1)
-
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("huge.wav", oversized, "audio/wav")},
-        )
-
-    assert resp.status_code == 400
-    body = resp.json()
-    assert body["error"]["code"] == "FILE_TOO_LARGE"
-
-
-# ---------------------------------------------------------------------------
-# Test 9: Audio too short -> 400 AUDIO_TOO_SHORT
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_ingest_audio_too_short(client: AsyncClient, wav_bytes: bytes):
-    """Pipeline returns 'skipped' with 'too short' -> 400 AUDIO_TOO_SHORT."""
-    short_result = MagicMock()
-    short_result.status = "skipped"
-    short_result.error = "Too short: 1.5s (min: 3.0s)"
-    short_result.track_id = None
-
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-        patch(
-            "app.routers.ingest.ingest_file",
-            new_callable=AsyncMock,
-            return_value=short_result,
+@pytest.mark.parametrize(
+    ("upload_body", "mime", "pipeline_result", "max_upload_bytes", "expected_code"),
+    [
+        pytest.param(
+            _multipart_body("readme.txt", b"Hello world", "text/plain"),
+            "text/plain",
+            None,
+            None,
+            "UNSUPPORTED_FORMAT",
+            id="unsupported-format",
         ),
-    ):
-        mock_magic.from_buffer.return_value = "audio/wav"
-
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("short.wav", wav_bytes, "audio/wav")},
-        )
-
-    assert resp.status_code == 400
-    body = resp.json()
-    assert body["error"]["code"] == "AUDIO_TOO_SHORT"
-
-
-# ---------------------------------------------------------------------------
-# Test 10: Audio too long -> 400 AUDIO_TOO_LONG
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_ingest_audio_too_long(client: AsyncClient, wav_bytes: bytes):
-    """Pipeline returns 'skipped' with 'too long' -> 400 AUDIO_TOO_LONG."""
-    long_result = MagicMock()
-    long_result.status = "skipped"
-    long_result.error = "Too long: 2000.0s (max: 1800.0s)"
-    long_result.track_id = None
-
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-        patch(
-            "app.routers.ingest.ingest_file",
-            new_callable=AsyncMock,
-            return_value=long_result,
+        pytest.param(
+            _multipart_body("empty.wav", b"", "audio/wav"),
+            "audio/wav",
+            None,
+            None,
+            "EMPTY_FILE",
+            id="empty-file",
         ),
-    ):
-        mock_magic.from_buffer.return_value = "audio/wav"
+        # The limit is patched down to 1 KiB so the size check is covered
+        # without allocating and shipping a 50 MB buffer.
+        pytest.param(
+            _multipart_body("huge.wav", bytes(1024 + 1), "audio/wav"),
+            "audio/wav",
+            None,
+            1024,
+            "FILE_TOO_LARGE",
+            id="file-too-large",
+        ),
+        pytest.param(
+            _WAV_UPLOAD_BODY,
+            "audio/wav",
+            _SHORT_RESULT,
+            None,
+            "AUDIO_TOO_SHORT",
+            id="audio-too-short",
+        ),
+        pytest.param(
+            _WAV_UPLOAD_BODY,
+            "audio/wav",
+            _LONG_RESULT,
+            None,
+            "AUDIO_TOO_LONG",
+            id="audio-too-long",
+        ),
+    ],
+)
+async def test_ingest_rejected_upload(
+    client: AsyncClient,
+    mock_magic: MagicMock,
+    upload_body: bytes,
+    mime: str,
+    pipeline_result: IngestResult | None,
+    max_upload_bytes: int | None,
+    expected_code: str,
+):
+    """Rejected uploads -> 400 with the matching error code.
+
+    Covers the MIME check, the empty/size validations, and the pipeline
+    'skipped' result mapping; the cases differ only in payload, patched
+    limit, and mocked pipeline result.
+    """
+    mock_magic.from_buffer.return_value = mime
+
+    with ExitStack() as stack:
+        if pipeline_result is not None:
+            stack.enter_context(
+                patch(
+                    "app.routers.ingest.ingest_file",
+                    new_callable=AsyncMock,
+                    return_value=pipeline_result,
+                )
+            )
+        if max_upload_bytes is not None:
+            stack.enter_context(patch("app.routers.ingest.MAX_UPLOAD_BYTES", max_upload_bytes))
 
         resp = await client.post(
             "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            files={"audio": ("long.wav", wav_bytes, "audio/wav")},
+            headers={"X-Admin-Key": _TEST_ADMIN_KEY, **_MULTIPART_HEADERS},
+            content=upload_body,
         )
 
     assert resp.status_code == 400
     body = resp.json()
-    assert body["error"]["code"] == "AUDIO_TOO_LONG"
+    assert body["error"]["code"] == expected_code
 
 
 # ---------------------------------------------------------------------------
@@ -412,46 +462,44 @@ async def test_ingest_audio_too_long(client: AsyncClient, wav_bytes: bytes):
 
 
 @pytest.mark.asyncio
-async def test_ingest_concurrent_rejection(ingest_app: FastAPI, wav_bytes: bytes):
+async def test_ingest_concurrent_rejection(ingest_app: FastAPI, mock_magic: MagicMock):
     """Two simultaneous requests -> one succeeds (201), one rejected (429)."""
-    # Use an event to hold the first request in the pipeline
+    # Event pair: entered_event signals that the first request holds the
+    # lock, hold_event keeps it there until the second request is done.
+    entered_event = asyncio.Event()
     hold_event = asyncio.Event()
 
     async def slow_ingest(*args, **kwargs):
         """Simulate a slow ingestion that waits for the event."""
+        entered_event.set()
         await hold_event.wait()
-        return _make_success_result()
-
-    with (
-        patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)),
-        patch("app.routers.ingest.magic") as mock_magic,
-        patch(
-            "app.routers.ingest.ingest_file",
-            new_callable=AsyncMock,
-            side_effect=slow_ingest,
-        ),
-    ):
-        mock_magic.from_buffer.return_value = "audio/wav"
+        return _SUCCESS_RESULT
 
+    with patch(
+        "app.routers.ingest.ingest_file",
+        new_callable=AsyncMock,
+        side_effect=slow_ingest,
+    ):
         transport = ASGITransport(app=ingest_app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             # Start first request (will be held by slow_ingest)
             task1 = asyncio.create_task(
                 ac.post(
                     "/api/v1/ingest",
-                    headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-                    files={"audio": ("test1.wav", wav_bytes, "audio/wav")},
+                    headers={"X-Admin-Key": _TEST_ADMIN_KEY, **_MULTIPART_HEADERS},
+                    content=_WAV_UPLOAD_BODY,
                 )
             )
 
-            # Give the first request time to acquire the lock
-            await asyncio.sleep(0.1)
+            # Wait until the first request has actually acquired the lock
+            # (a handshake, not a sleep: no fixed delay, no flakiness).
+            await entered_event.wait()
 
             # Second request should be rejected while first holds lock
             resp2 = await ac.post(
                 "/api/v1/ingest",
-                headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-                files={"audio": ("test2.wav", wav_bytes, "audio/wav")},
+                headers={"X-Admin-Key": _TEST_ADMIN_KEY, **_MULTIPART_HEADERS},
+                content=_WAV_UPLOAD_BODY,
             )
 
             # Release the first request
@@ -470,13 +518,14 @@ async def test_ingest_concurrent_rejection(ingest_app: FastAPI, wav_bytes: bytes
 
 
 @pytest.mark.asyncio
-async def test_ingest_missing_audio_field(client: AsyncClient):
+async def test_ingest_missing_audio_field(ingest_app: FastAPI):
     """Request without the 'audio' file field -> 422 Unprocessable Entity."""
-    with patch("app.auth.admin.settings", MagicMock(admin_api_key=_TEST_ADMIN_KEY)):
-        resp = await client.post(
-            "/api/v1/ingest",
-            headers={"X-Admin-Key": _TEST_ADMIN_KEY},
-            # No files= parameter -> missing 'audio' field
-        )
+    # Empty body, no multipart content-type -> missing 'audio' field
+    status, _ = await _call_app(
+        ingest_app,
+        "POST",
+        "/api/v1/ingest",
+        headers={"X-Admin-Key": _TEST_ADMIN_KEY},
+    )
 
-    assert resp.status_code == 422
+    assert status == 422
